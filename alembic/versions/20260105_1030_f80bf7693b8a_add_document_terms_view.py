@@ -0,0 +1,47 @@
+"""add_document_terms_view
+
+Revision ID: f80bf7693b8a
+Revises: 8d0d82f26562
+Create Date: 2026-01-05 10:30:12.481920
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f80bf7693b8a"
+down_revision: Union[str, None] = "8d0d82f26562"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Vocabulary of OCR'd words with document frequency, used for autocomplete
+    op.execute(
+        r"""
+        CREATE MATERIALIZED VIEW document_terms AS
+        SELECT word, COUNT(*) AS df
+        FROM (
+            SELECT regexp_split_to_table(lower(raw_text), '\s+') AS word
+            FROM documents
+            WHERE raw_text IS NOT NULL
+        ) t
+        WHERE length(word) >= 3
+        GROUP BY word
+        """
+    )
+
+    # Unique index allows REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index("idx_document_terms_word", "document_terms", ["word"], unique=True)
+    op.execute(
+        "CREATE INDEX idx_document_terms_word_prefix "
+        "ON document_terms (word text_pattern_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS document_terms")
@@ -0,0 +1,62 @@
+"""generated_text_search_vector
+
+Revision ID: 9cadba12337d
+Revises: f80bf7693b8a
+Create Date: 2026-01-06 09:15:47.203318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9cadba12337d"
+down_revision: Union[str, None] = "f80bf7693b8a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Let PostgreSQL maintain the search vector whenever raw_text changes
+    op.drop_index("idx_documents_text_search", table_name="documents", postgresql_using="gin")
+    op.drop_column("documents", "text_search_vector")
+    op.add_column(
+        "documents",
+        sa.Column(
+            "text_search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', coalesce(raw_text, ''))", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_documents_text_search",
+        "documents",
+        ["text_search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_documents_text_search", table_name="documents", postgresql_using="gin")
+    op.drop_column("documents", "text_search_vector")
+    op.add_column(
+        "documents",
+        sa.Column("text_search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+    op.execute(
+        "UPDATE documents SET text_search_vector = to_tsvector('english', raw_text) "
+        "WHERE raw_text IS NOT NULL"
+    )
+    op.create_index(
+        "idx_documents_text_search",
+        "documents",
+        ["text_search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
@@ -0,0 +1,54 @@
+"""trim_document_terms_punctuation
+
+Revision ID: 79b8432f9013
+Revises: 9cadba12337d
+Create Date: 2026-01-07 14:02:31.975104
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "79b8432f9013"
+down_revision: Union[str, None] = "9cadba12337d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_document_terms(word_expr: str) -> None:
+    op.execute(
+        rf"""
+        CREATE MATERIALIZED VIEW document_terms AS
+        SELECT word, COUNT(*) AS df
+        FROM (
+            SELECT {word_expr} AS word
+            FROM (
+                SELECT regexp_split_to_table(lower(raw_text), '\s+') AS token
+                FROM documents
+                WHERE raw_text IS NOT NULL
+            ) tokens
+        ) t
+        WHERE length(word) >= 3
+        GROUP BY word
+        """
+    )
+    op.create_index("idx_document_terms_word", "document_terms", ["word"], unique=True)
+    op.execute(
+        "CREATE INDEX idx_document_terms_word_prefix "
+        "ON document_terms (word text_pattern_ops)"
+    )
+
+
+def upgrade() -> None:
+    # Strip surrounding punctuation in SQL so suggestions need no Python cleanup
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS document_terms")
+    _create_document_terms("trim(both E'.,!?;:\"''()[]{}' from token)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS document_terms")
+    _create_document_terms("token")
@@ -0,0 +1,56 @@
+"""add_document_listing_covering_indexes
+
+Revision ID: 7e89b015bba5
+Revises: 79b8432f9013
+Create Date: 2026-01-08 11:20:05.618233
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7e89b015bba5"
+down_revision: Union[str, None] = "79b8432f9013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covering indexes for the dashboard listing (filter + newest first)
+    op.create_index(
+        "idx_documents_status_upload_ts",
+        "documents",
+        ["status", sa.text("upload_timestamp DESC")],
+        unique=False,
+        postgresql_include=[
+            "id",
+            "document_type",
+            "filename",
+            "ocr_confidence",
+            "processing_started_at",
+            "processing_completed_at",
+        ],
+    )
+    op.create_index(
+        "idx_documents_type_upload_ts",
+        "documents",
+        ["document_type", sa.text("upload_timestamp DESC")],
+        unique=False,
+        postgresql_include=[
+            "id",
+            "status",
+            "filename",
+            "ocr_confidence",
+            "processing_started_at",
+            "processing_completed_at",
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_documents_type_upload_ts", table_name="documents")
+    op.drop_index("idx_documents_status_upload_ts", table_name="documents")
@@ -0,0 +1,47 @@
+"""Helpers shared by the scripts that exercise a running API."""
+import time
+
+# orjson parses response bodies in C; fall back to the stdlib if it is missing
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+TERMINAL_STATUSES = ("completed", "failed", "needs_review")
+
+
+def poll_until_done(client, url, timeout, max_delay=3.0, request_timeout=10, show_progress=False):
+    """Poll a document URL until its status is terminal.
+
+    Waits 0.25s before the first check and 1.5x longer after each one, up to
+    ``max_delay``, for at most ``timeout`` seconds. ``client`` is the
+    ``requests`` module or a ``requests.Session``.
+
+    Returns:
+        The terminal response body, or None on timeout
+    """
+    delay = 0.25
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 1.5, max_delay)
+        response = client.get(url, timeout=request_timeout)
+        if response.status_code != 200:
+            if show_progress:
+                print(f"Status check failed: {response.status_code}")
+            continue
+
+        data = parse_json(response)
+        if show_progress:
+            print(f"Status: {data.get('status')}")
+        if data.get('status') in TERMINAL_STATUSES:
+            return data
+
+    return None
+
+
+def parse_json(response):
+    """Decode a response body as JSON straight from its raw bytes."""
+    return _loads(response.content)
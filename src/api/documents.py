@@ -17,6 +17,7 @@ from src.core.database import get_async_session
 from src.models import Document, DocumentStatus, DocumentType
 from src.schemas import (
     DocumentDetailResponse,
+    DocumentListItem,
     DocumentListResponse,
     DocumentStatusResponse,
     DocumentUploadResponse,
@@ -164,11 +165,17 @@ async def get_document(
 )
 async def get_document_status(
     document_id: uuid.UUID,
+    preview_chars: int = Query(0, ge=0, le=2000),
     session: AsyncSession = Depends(get_async_session),
 ) -> DocumentStatusResponse:
-    """Get the current processing status of a document."""
+    """Get the current processing status of a document.
+
+    With ``preview_chars`` set, the response also carries the first
+    characters of the OCR text and its total length, so clients that only
+    show a preview can skip fetching the full document.
+    """
     repo = DocumentRepository(session)
-    document = await repo.get_document(document_id)
+    document = await repo.get_document_bare(document_id)
     
     if not document:
         raise HTTPException(
@@ -186,6 +193,14 @@ async def get_document_status(
         processing_started_at=document.processing_started_at,
         processing_completed_at=document.processing_completed_at,
         error_log=document.error_log,
+        raw_text_preview=(
+            document.raw_text[:preview_chars]
+            if preview_chars and document.raw_text is not None else None
+        ),
+        raw_text_length=(
+            len(document.raw_text)
+            if preview_chars and document.raw_text is not None else None
+        ),
     )
 
 
@@ -200,7 +215,7 @@ async def get_document_ocr(
 ) -> OCRResponse:
     """Get the full OCR details including bounding boxes."""
     repo = DocumentRepository(session)
-    document = await repo.get_document(document_id)
+    document = await repo.get_document_bare(document_id)
     
     if not document:
         raise HTTPException(
@@ -208,17 +223,16 @@ async def get_document_ocr(
             detail=f"Document not found: {document_id}",
         )
     
-    # Map OCR Result (ORM) to OCRResultSchema
+    # Map OCR Result (ORM) to OCRResultSchema, streaming rows from the DB
     results = []
-    if document.ocr_results:
-        for ocr_res in document.ocr_results:
-            results.append({
-                "text": ocr_res.text,
-                "confidence": ocr_res.confidence,
-                "bounding_box": ocr_res.bounding_box,
-                "page_number": int(ocr_res.page_number or 1),
-                "sequence_order": int(ocr_res.sequence_order) if ocr_res.sequence_order is not None else None
-            })
+    async for ocr_res in repo.get_ocr_results(document_id):
+        results.append({
+            "text": ocr_res.text,
+            "confidence": ocr_res.confidence,
+            "bounding_box": ocr_res.bounding_box,
+            "page_number": int(ocr_res.page_number or 1),
+            "sequence_order": int(ocr_res.sequence_order) if ocr_res.sequence_order is not None else None
+        })
 
     return OCRResponse(
         document_id=document.id,
@@ -229,6 +243,23 @@ async def get_document_ocr(
     )
 
 
+def _encode_cursor(document: Document) -> str:
+    """Encode a document's sort key as an opaque listing cursor."""
+    return f"{document.upload_timestamp.isoformat()}_{document.id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a listing cursor back into ``(upload_timestamp, id)``."""
+    try:
+        timestamp, document_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(timestamp), uuid.UUID(document_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {cursor}",
+        )
+
+
 @router.get(
     "",
     response_model=DocumentListResponse,
@@ -239,22 +270,40 @@ async def list_documents(
     type_filter: DocumentType | None = Query(None, alias="type"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
     session: AsyncSession = Depends(get_async_session),
 ) -> DocumentListResponse:
-    """List documents with filtering and pagination."""
+    """List documents with filtering and pagination.
+    
+    Pages are numbered by default. Passing ``cursor`` switches to keyset
+    pagination, which costs the same at any depth and skips the total count:
+    an empty cursor starts from the newest document, and each response's
+    ``next_cursor`` fetches the page after it.
+    """
     repo = DocumentRepository(session)
-    documents, total = await repo.list_documents(
-        status=status_filter,
-        document_type=type_filter,
-        page=page,
-        page_size=page_size,
-    )
     
-    total_pages = (total + page_size - 1) // page_size
+    if cursor is not None:
+        documents, has_more = await repo.list_documents_after(
+            cursor=_decode_cursor(cursor) if cursor else None,
+            status=status_filter,
+            document_type=type_filter,
+            page_size=page_size,
+        )
+        total = total_pages = None
+        page = None
+    else:
+        documents, total = await repo.list_documents(
+            status=status_filter,
+            document_type=type_filter,
+            page=page,
+            page_size=page_size,
+        )
+        total_pages = (total + page_size - 1) // page_size
+        has_more = page < total_pages
     
     return DocumentListResponse(
         documents=[
-            DocumentStatusResponse(
+            DocumentListItem(
                 id=doc.id,
                 filename=doc.filename,
                 status=doc.status,
@@ -263,7 +312,6 @@ async def list_documents(
                 upload_timestamp=doc.upload_timestamp,
                 processing_started_at=doc.processing_started_at,
                 processing_completed_at=doc.processing_completed_at,
-                error_log=doc.error_log,
             )
             for doc in documents
         ],
@@ -271,6 +319,7 @@ async def list_documents(
         page=page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=_encode_cursor(documents[-1]) if has_more and documents else None,
     )
 
 
@@ -287,7 +336,7 @@ async def reprocess_document_endpoint(
 ) -> DocumentStatusResponse:
     """Reprocess a failed or flagged document."""
     repo = DocumentRepository(session)
-    document = await repo.get_document(document_id)
+    document = await repo.get_document_bare(document_id)
     
     if not document:
         raise HTTPException(
@@ -328,7 +377,7 @@ async def update_document_review(
 ) -> ReviewResponse:
     """Update extracted data after human review."""
     repo = DocumentRepository(session)
-    document = await repo.get_document(document_id)
+    document = await repo.get_document_bare(document_id)
     
     if not document:
         raise HTTPException(
@@ -375,7 +424,7 @@ async def delete_document(
 ) -> None:
     """Delete a document and its associated files."""
     repo = DocumentRepository(session)
-    document = await repo.get_document(document_id)
+    document = await repo.get_document_full(document_id)
     
     if not document:
         raise HTTPException(
@@ -407,7 +456,7 @@ async def download_document(
 ):
     """Download the original document file."""
     repo = DocumentRepository(session)
-    document = await repo.get_document(document_id)
+    document = await repo.get_document_bare(document_id)
     
     if not document:
         raise HTTPException(
@@ -48,7 +48,7 @@ async def document_detail_page(
 ):
     """Document detail page."""
     repo = DocumentRepository(db)
-    document = await repo.get_document(document_id)
+    document = await repo.get_document_full(document_id)
     
     if not document:
         return templates.TemplateResponse(
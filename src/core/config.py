@@ -40,10 +40,19 @@ class Settings(BaseSettings):
     # Storage
     upload_dir: Path = Path("./temp")
     max_upload_size_mb: int = 50
+    # hashlib algorithm for file content hashes; blake2b is faster than
+    # sha256 on CPUs without SHA extensions
+    content_hash_algo: str = "sha256"
 
     # OCR
     ocr_confidence_threshold: float = 0.3
     ocr_language: str = "en"
+    # Run one inference when a worker starts so the first document is not slow
+    ocr_warmup: bool = True
+
+    # Search
+    # Seconds between celery beat refreshes of the search-suggestion vocabulary
+    document_terms_refresh_seconds: int = 300
 
     # LLM
     openai_api_key: str | None = None
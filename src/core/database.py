@@ -5,7 +5,7 @@ from contextlib import asynccontextmanager
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, scoped_session, sessionmaker
 
 from src.core.config import settings
 
@@ -45,6 +45,9 @@ SyncSessionLocal = sessionmaker(
     autoflush=False,
 )
 
+# Long-lived per-thread session for worker-side bookkeeping (e.g. task failure hooks)
+ScopedSyncSession = scoped_session(SyncSessionLocal)
+
 # Base class for models
 Base = declarative_base()
 
@@ -5,6 +5,7 @@ from datetime import datetime
 
 from sqlalchemy import (
     Column,
+    Computed,
     DateTime,
     Enum,
     Float,
@@ -57,8 +58,12 @@ class Document(Base):
     ocr_confidence = Column(Float, nullable=True)
     raw_text = Column(Text, nullable=True)
     
-    # Full-text search vector
-    text_search_vector = Column(TSVECTOR, nullable=True)
+    # Full-text search vector, maintained by PostgreSQL from raw_text
+    text_search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(raw_text, ''))", persisted=True),
+        nullable=True,
+    )
 
     # Timestamps
     upload_timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -89,6 +94,32 @@ class Document(Base):
         Index("idx_documents_status", "status"),
         Index("idx_documents_type", "document_type"),
         Index("idx_documents_upload_timestamp", "upload_timestamp"),
+        Index(
+            "idx_documents_status_upload_ts",
+            "status",
+            upload_timestamp.desc(),
+            postgresql_include=[
+                "id",
+                "document_type",
+                "filename",
+                "ocr_confidence",
+                "processing_started_at",
+                "processing_completed_at",
+            ],
+        ),
+        Index(
+            "idx_documents_type_upload_ts",
+            "document_type",
+            upload_timestamp.desc(),
+            postgresql_include=[
+                "id",
+                "status",
+                "filename",
+                "ocr_confidence",
+                "processing_started_at",
+                "processing_completed_at",
+            ],
+        ),
         Index(
             "idx_documents_text_search",
             "text_search_vector",
@@ -4,6 +4,7 @@ from src.schemas.document import (
     BoundingBox,
     DashboardMetrics,
     DocumentDetailResponse,
+    DocumentListItem,
     DocumentListResponse,
     DocumentStatusResponse,
     DocumentUploadResponse,
@@ -24,6 +25,7 @@ __all__ = [
     "DocumentUploadResponse",
     "DocumentStatusResponse",
     "DocumentDetailResponse",
+    "DocumentListItem",
     "DocumentListResponse",
     "BoundingBox",
     "OCRResultSchema",
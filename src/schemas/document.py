@@ -43,6 +43,21 @@ class DocumentStatusResponse(BaseSchema):
     processing_started_at: datetime | None = None
     processing_completed_at: datetime | None = None
     error_log: str | None = None
+    raw_text_preview: str | None = None
+    raw_text_length: int | None = None
+
+
+class DocumentListItem(BaseSchema):
+    """Document summary in a listing; error details need a status query."""
+    
+    id: UUID
+    filename: str
+    status: DocumentStatus
+    document_type: DocumentType | None = None
+    ocr_confidence: float | None = None
+    upload_timestamp: datetime
+    processing_started_at: datetime | None = None
+    processing_completed_at: datetime | None = None
 
 
 class DocumentDetailResponse(BaseSchema):
@@ -66,13 +81,18 @@ class DocumentDetailResponse(BaseSchema):
 
 
 class DocumentListResponse(BaseSchema):
-    """Response for listing documents."""
+    """Response for listing documents.
     
-    documents: list[DocumentStatusResponse]
-    total: int
-    page: int
+    Cursor-paginated responses leave the page counters unset and page on
+    ``next_cursor`` instead.
+    """
+    
+    documents: list[DocumentListItem]
+    total: int | None = None
+    page: int | None = None
     page_size: int
-    total_pages: int
+    total_pages: int | None = None
+    next_cursor: str | None = None
 
 
 # ============== OCR Schemas ==============
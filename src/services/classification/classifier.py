@@ -3,13 +3,33 @@
 import logging
 import re
 from collections import Counter
+from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 
 from src.models.enums import DocumentType
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _keyword_pattern(keyword: str) -> re.Pattern[str]:
+    """Compile the word-boundary pattern used to count a single keyword."""
+    return re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
+
+
+def _compile_keyword_scanner(keywords: Iterable[str]) -> re.Pattern[str]:
+    """
+    Compile one alternation that finds keyword starts in a single pass.
+
+    Alternatives sit inside a lookahead and are ordered longest first, so a
+    keyword matching at a position is always a prefix of the one reported there.
+    """
+    ordered = sorted(set(keywords), key=lambda k: (-len(k), k))
+    alternation = "|".join(re.escape(k) + r'\b' for k in ordered)
+    return re.compile(r'(?=\b(' + alternation + r'))', re.IGNORECASE)
+
+
 @dataclass
 class ClassificationResult:
     """Result of document classification."""
@@ -157,6 +177,9 @@ class DocumentClassifier:
         # Calculate TF-IDF weights for the document
         tf_weights = self._calculate_tf_weights(normalized_text)
 
+        # Exact keyword counts shared by every document type
+        keyword_counts = self._count_keywords(normalized_text)
+
         # Calculate scores for each document type
         scores: dict[DocumentType, float] = {}
         matched: dict[DocumentType, list[str]] = {}
@@ -166,6 +189,7 @@ class DocumentClassifier:
                 normalized_text,
                 keywords,
                 self.STRONG_INDICATORS.get(doc_type, []),
+                keyword_counts,
             )
             
             # Add TF-IDF weighted bonus
@@ -233,6 +257,7 @@ class DocumentClassifier:
         text: str,
         keywords: list[str],
         strong_indicators: list[str],
+        keyword_counts: dict[str, int] | None = None,
     ) -> tuple[float, list[str]]:
         """
         Calculate classification score using fuzzy keyword matching.
@@ -242,6 +267,7 @@ class DocumentClassifier:
             text: Normalized text
             keywords: List of keywords to search for
             strong_indicators: Keywords with higher weight
+            keyword_counts: Precomputed word-boundary counts from _count_keywords
             
         Returns:
             Tuple of (score, list of matched keywords)
@@ -253,8 +279,9 @@ class DocumentClassifier:
             matched = False
             
             # 1. Exact word boundary match (highest confidence)
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            count = len(re.findall(pattern, text, re.IGNORECASE))
+            count = keyword_counts.get(keyword) if keyword_counts else None
+            if count is None:
+                count = len(_keyword_pattern(keyword).findall(text))
             if count > 0:
                 matched = True
                 score += min(count, 3) * (2.0 / len(keywords))  # Boosted weight
@@ -316,6 +343,23 @@ class DocumentClassifier:
 
         return score, matches
     
+    def _count_keywords(self, text: str) -> dict[str, int]:
+        """
+        Count word-boundary occurrences of every known keyword.
+
+        One scan over the text finds which keywords can occur at all; only
+        those are counted with their own pattern, the rest are zero.
+        """
+        starts = {match.lower() for match in _KEYWORD_SCANNER.findall(text)}
+        return {
+            keyword: (
+                len(_keyword_pattern(keyword).findall(text))
+                if any(start.startswith(keyword) for start in starts)
+                else 0
+            )
+            for keyword in _SCANNED_KEYWORDS
+        }
+
     def _levenshtein_ratio(self, s1: str, s2: str) -> float:
         """Calculate similarity ratio between two strings using Levenshtein distance."""
         if len(s1) == 0 or len(s2) == 0:
@@ -608,6 +652,14 @@ Respond with ONLY the category name (e.g., INVOICE) and nothing else."""
             return keyword_result
 
 
+_SCANNED_KEYWORDS = frozenset(
+    keyword
+    for keywords in DocumentClassifier.KEYWORD_PATTERNS.values()
+    for keyword in keywords
+)
+_KEYWORD_SCANNER = _compile_keyword_scanner(_SCANNED_KEYWORDS)
+
+
 def classify_document(text: str) -> ClassificationResult:
     """
     Convenience function to classify a document.
@@ -4,6 +4,7 @@ from src.services.ocr.ocr_service import (
     OCRDetection,
     OCRPageResult,
     OCRService,
+    get_ocr_service,
     process_document_ocr,
 )
 
@@ -11,5 +12,6 @@ __all__ = [
     "OCRService",
     "OCRDetection",
     "OCRPageResult",
+    "get_ocr_service",
     "process_document_ocr",
 ]
@@ -3,6 +3,7 @@
 import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -217,6 +218,23 @@ class OCRService:
 
         return _paddle_ocr_instance
 
+    def warmup(self, run_inference: bool = True) -> None:
+        """
+        Load the models and, by default, run one tiny inference.
+
+        PaddleOCR sets up its inference kernels on the first prediction, which
+        makes that call much slower than later ones; this pays the cost up front.
+
+        Args:
+            run_inference: Also run a prediction; False only loads the models
+        """
+        try:
+            ocr = self.ocr
+            if run_inference:
+                ocr.predict(np.full((64, 64, 3), 255, dtype=np.uint8))
+        except Exception as e:
+            logger.warning(f"OCR warmup failed: {e}")
+
     def _deduplicate_detections(self, detections: list[tuple]) -> list[tuple]:
         """Remove duplicate detections from multi-scale processing."""
         if not detections:
@@ -553,15 +571,8 @@ class OCRService:
                           for i in range(256)]).astype(np.uint8)
         return cv2.LUT(image, table)
     
-    def _ensemble_ocr(self, image: NDArray[np.uint8]) -> tuple[str, float, list]:
-        """
-        Run OCR with multiple preprocessing pipelines and merge results.
-        Uses confidence-weighted voting for best accuracy.
-        """
-        import cv2
-        
-        all_results = []
-        
+    def _ocr_variants(self, image: NDArray[np.uint8]) -> list[tuple[str, NDArray[np.uint8]]]:
+        """Build the preprocessing variants that the ensemble runs OCR on."""
         # Apply deskewing first
         deskewed = self._deskew_image(image)
         
@@ -577,30 +588,75 @@ class OCRService:
             upscaled = self._super_resolution_upscale(deskewed)
             variants.append(("super_res", self._preprocess_image(upscaled)))
         
-        # Run OCR on each variant
-        for name, variant in variants:
+        return variants
+
+    @staticmethod
+    def _collect_predictions(page_result, name: str, all_results: list) -> None:
+        """Append (bbox, text, conf, source) tuples from one PaddleOCR result."""
+        # Access dict-like OCRResult fields
+        rec_texts = page_result.get('rec_texts', [])
+        rec_scores = page_result.get('rec_scores', [])
+        rec_polys = page_result.get('rec_polys', page_result.get('dt_polys', []))
+        
+        for i, text in enumerate(rec_texts):
+            if text and i < len(rec_scores):
+                conf = float(rec_scores[i])
+                bbox = rec_polys[i].tolist() if i < len(rec_polys) else []
+                all_results.append((bbox, text, conf, name))
+
+    def _ensemble_ocr(self, image: NDArray[np.uint8]) -> tuple[str, float, list]:
+        """
+        Run OCR with multiple preprocessing pipelines and merge results.
+        Uses confidence-weighted voting for best accuracy.
+        """
+        all_results = []
+        
+        # Run OCR on each variant; a failing variant does not affect the others
+        for name, variant in self._ocr_variants(image):
             try:
-                result = self.ocr.predict(variant)
-                if result:
-                    # New PaddleOCR API returns OCRResult objects
-                    for page_result in result:
-                        # Access dict-like OCRResult fields
-                        rec_texts = page_result.get('rec_texts', [])
-                        rec_scores = page_result.get('rec_scores', [])
-                        rec_polys = page_result.get('rec_polys', page_result.get('dt_polys', []))
-                        
-                        for i, text in enumerate(rec_texts):
-                            if text and i < len(rec_scores):
-                                conf = float(rec_scores[i])
-                                bbox = rec_polys[i].tolist() if i < len(rec_polys) else []
-                                all_results.append((bbox, text, conf, name))
+                for page_result in self.ocr.predict(variant) or []:
+                    self._collect_predictions(page_result, name, all_results)
             except Exception as e:
                 logger.warning(f"OCR variant '{name}' failed: {e}")
         
         # Merge results using confidence-weighted voting
-        merged_text, avg_confidence, final_detections = self._merge_ocr_results(all_results)
+        return self._merge_ocr_results(all_results)
+
+    def _ensemble_ocr_batch(
+        self,
+        images: list[NDArray[np.uint8]],
+    ) -> list[tuple[str, float, list]]:
+        """
+        Run the OCR ensemble for several images with a single predictor call.
+        
+        The variants of every image are submitted together so PaddleOCR can
+        batch them; if that call fails, each variant is retried on its own.
+        All variants are held in memory at once, so callers should pass a
+        bounded number of images (see ``process_batch``).
+        """
+        variants = []
+        for index, image in enumerate(images):
+            variants.extend((index, name, variant) for name, variant in self._ocr_variants(image))
+        
+        per_image: list[list] = [[] for _ in images]
         
-        return merged_text, avg_confidence, final_detections
+        try:
+            predictions = self.ocr.predict([variant for _, _, variant in variants])
+            for (index, name, _), page_result in zip(variants, predictions or []):
+                self._collect_predictions(page_result, name, per_image[index])
+        except Exception as e:
+            logger.warning(f"Batched OCR failed, running variants one by one: {e}")
+            per_image = [[] for _ in images]
+            for index, name, variant in variants:
+                try:
+                    result = self.ocr.predict(variant)
+                    for page_result in result or []:
+                        self._collect_predictions(page_result, name, per_image[index])
+                except Exception as e:
+                    logger.warning(f"OCR variant '{name}' failed: {e}")
+        
+        # Merge results using confidence-weighted voting
+        return [self._merge_ocr_results(all_results) for all_results in per_image]
     
     def _merge_ocr_results(self, all_results: list) -> tuple[str, float, list]:
         """
@@ -777,7 +833,19 @@ class OCRService:
 
         # 1. Run Ensemble OCR (Professional Grade)
         # This includes Deskewing, Super-Resolution (if needed), Multi-pipeline voting
-        raw_text, avg_confidence, internal_detections = self._ensemble_ocr(image)
+        ensemble = self._ensemble_ocr(image)
+        
+        return self._build_page_result(image, ensemble, page_number, scientific_mode)
+
+    def _build_page_result(
+        self,
+        image: NDArray[np.uint8],
+        ensemble: tuple[str, float, list],
+        page_number: int,
+        scientific_mode: bool,
+    ) -> OCRPageResult:
+        """Turn merged ensemble output into a page result with layout and math."""
+        raw_text, avg_confidence, internal_detections = ensemble
         
         # Convert internal detections (tuples) to OCRDetection objects
         detections = []
@@ -840,9 +908,9 @@ class OCRService:
         Returns:
             List of OCRPageResult for each page
         """
+        # Pages go through OCR one at a time so memory stays at one page's variants
         results = []
         for i, image in enumerate(images, start=1):
-            # Pass scientific_mode to process_image
             result = self.process_image(image, page_number=i, scientific_mode=scientific_mode)
             results.append(result)
             logger.info(f"Processed page {i}/{len(images)}, confidence: {result.average_confidence:.2%}")
@@ -863,7 +931,47 @@ class OCRService:
         Returns:
             List of OCRPageResult for each page
         """
-        import cv2
+        return self.process_images(self._load_pages(file_path), scientific_mode=scientific_mode)
+
+    def process_batch(
+        self,
+        file_paths: list[str | Path],
+        scientific_mode: bool = False,
+        batch_pages: int = 4,
+    ) -> list[list[OCRPageResult]]:
+        """
+        Process several files with batched OCR passes.
+        
+        Pages from all files are sent to the predictor ``batch_pages`` at a
+        time, which bounds how many preprocessed variants are held at once.
+        
+        Args:
+            file_paths: Paths to image or PDF files
+            scientific_mode: Whether to enable scientific/math mode extraction
+            batch_pages: Maximum number of pages per predictor call
+            
+        Returns:
+            One list of OCRPageResult per file, in input order
+        """
+        pages_per_file = [self._load_pages(path) for path in file_paths]
+        all_pages = [page for pages in pages_per_file for page in pages]
+        ensembles = iter([
+            ensemble
+            for start in range(0, len(all_pages), batch_pages)
+            for ensemble in self._ensemble_ocr_batch(all_pages[start:start + batch_pages])
+        ])
+        
+        results = []
+        for pages in pages_per_file:
+            results.append([
+                self._build_page_result(page, next(ensembles), i, scientific_mode)
+                for i, page in enumerate(pages, start=1)
+            ])
+        
+        return results
+
+    def _load_pages(self, file_path: str | Path) -> list[NDArray[np.uint8]]:
+        """Read a file (image or PDF) into preprocessed page images."""
         from src.services.preprocessing import (
             ImagePreprocessor,
             PDFConverter,
@@ -902,8 +1010,7 @@ class OCRService:
             )
             processed_images.append(processed)
 
-        # Process with OCR
-        return self.process_images(processed_images, scientific_mode=scientific_mode)
+        return processed_images
 
     def _sort_detections(
         self,
@@ -1060,6 +1167,17 @@ class OCRService:
         return result.raw_text, boxes
 
 
+@lru_cache(maxsize=4)
+def get_ocr_service(language: str = "en") -> OCRService:
+    """
+    Return a shared OCR service for a language.
+    
+    The service holds no per-call state, so callers in the same process can
+    reuse one instance instead of rebuilding it (and its math service).
+    """
+    return OCRService(language=language)
+
+
 def process_document_ocr(
     file_path: str | Path,
     language: str = "en",
@@ -1077,7 +1195,7 @@ def process_document_ocr(
     Returns:
         Dictionary with OCR results and metadata
     """
-    ocr_service = OCRService(language=language)
+    ocr_service = get_ocr_service(language)
     results = ocr_service.process_file(file_path, scientific_mode=scientific_mode)
     
     # Combine all pages
@@ -59,7 +59,9 @@ class ImagePreprocessor:
         Returns:
             Preprocessed image as numpy array
         """
-        processed = image.copy()
+        # Each step returns a new array, so the input is only copied at the end
+        # if no step produced one
+        processed = image
 
         # Step 1: Convert to grayscale
         if apply_grayscale and len(processed.shape) == 3:
@@ -83,9 +85,13 @@ class ImagePreprocessor:
 
         # Step 4: Binarize
         if apply_binarize:
-            processed = self.binarize(processed)
+            # Intermediate results are ours to overwrite
+            processed = self.binarize(processed, inplace=processed is not image)
             logger.debug("Applied binarization")
 
+        if processed is image:
+            processed = image.copy()
+
         return processed
 
     def to_grayscale(self, image: NDArray[np.uint8]) -> NDArray[np.uint8]:
@@ -132,7 +138,7 @@ class ImagePreprocessor:
                 21,
             )
 
-    def binarize(self, image: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    def binarize(self, image: NDArray[np.uint8], inplace: bool = False) -> NDArray[np.uint8]:
         """
         Apply adaptive thresholding to make text black and background white.
         
@@ -141,13 +147,15 @@ class ImagePreprocessor:
         
         Args:
             image: Grayscale image
+            inplace: Write the result into a grayscale input instead of a new array
             
         Returns:
             Binarized image
         """
-        # Ensure grayscale
+        # Ensure grayscale (the converted copy can always be overwritten)
         if len(image.shape) == 3:
             image = self.to_grayscale(image)
+            inplace = True
 
         # Apply adaptive thresholding
         binary = cv2.adaptiveThreshold(
@@ -157,6 +165,7 @@ class ImagePreprocessor:
             cv2.THRESH_BINARY,
             self.block_size,
             self.threshold_c,
+            dst=image if inplace else None,
         )
 
         return binary
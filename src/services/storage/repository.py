@@ -1,13 +1,15 @@
 """Document storage and database operations service."""
 
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, select, text, update
+from sqlalchemy import Select, bindparam, func, insert, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
 
 from src.models import (
     Document,
@@ -20,6 +22,25 @@ from src.models import (
 
 logger = logging.getLogger(__name__)
 
+# Statements reused on hot sync paths, built once so the compiled cache hits
+_DOCUMENT_BY_ID = select(Document).where(Document.id == bindparam("document_id"))
+
+# Columns needed by document listings; exactly the key and INCLUDE columns
+# of the covering status/type indexes, so filtered pages can be served by an
+# index-only scan. error_log is left out (unbounded text does not belong in
+# an index); it is available from the status and detail endpoints.
+_LIST_COLUMNS = load_only(
+    Document.id,
+    Document.filename,
+    Document.status,
+    Document.document_type,
+    Document.ocr_confidence,
+    Document.upload_timestamp,
+    Document.processing_started_at,
+    Document.processing_completed_at,
+    raiseload=True,
+)
+
 
 class DocumentRepository:
     """Repository for document database operations."""
@@ -104,76 +125,105 @@ class DocumentRepository:
         extraction_model: str | None = None,
         extraction_confidence: float | None = None,
     ) -> ExtractedMetadata:
-        """Create extracted metadata (sync version)."""
-        # Check if exists
-        existing = self.session.query(ExtractedMetadata).filter_by(document_id=document_id).first()
-        if existing:
-            existing.document_type = document_type
-            existing.data = data
-            existing.extraction_model = extraction_model
-            existing.extraction_confidence = extraction_confidence
-            existing.extraction_timestamp = datetime.utcnow()
-            self.session.flush()
-            return existing
+        """Create or replace extracted metadata (sync version).
 
-        metadata = ExtractedMetadata(
+        Uses ``INSERT ... ON CONFLICT (document_id) DO UPDATE`` so retried
+        Celery tasks cannot race each other into a duplicate insert.
+        """
+        stmt = pg_insert(ExtractedMetadata).values(
             document_id=document_id,
             document_type=document_type,
             data=data,
             extraction_model=extraction_model,
             extraction_confidence=extraction_confidence,
         )
-        self.session.add(metadata)
-        self.session.flush()
-        return metadata
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ExtractedMetadata.document_id],
+            set_={
+                "document_type": stmt.excluded.document_type,
+                "data": stmt.excluded.data,
+                "extraction_model": stmt.excluded.extraction_model,
+                "extraction_confidence": stmt.excluded.extraction_confidence,
+                "extraction_timestamp": func.timezone("UTC", func.now()),
+            },
+        ).returning(ExtractedMetadata)
+
+        return self.session.execute(
+            stmt,
+            execution_options={"populate_existing": True},
+        ).scalar_one()
+
+    @staticmethod
+    def _ocr_result_rows(
+        document_id: UUID,
+        results: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Build OCRResult parameter rows for an executemany INSERT.
+
+        Accepts raw OCR detections as well, whose page key is ``page``.
+        """
+        return [
+            {
+                "document_id": document_id,
+                "page_number": result.get("page_number") or result.get("page", 1),
+                "text": result["text"],
+                "confidence": result["confidence"],
+                "bounding_box": result["bounding_box"],
+                "sequence_order": result.get("sequence_order"),
+            }
+            for result in results
+        ]
 
     async def create_ocr_results(
         self,
         document_id: UUID,
         results: list[dict[str, Any]],
-    ) -> list[OCRResult]:
-        """Bulk create OCR results for a document."""
-        ocr_results = []
-        for result in results:
-            ocr_result = OCRResult(
-                document_id=document_id,
-                page_number=result.get("page_number", 1),
-                text=result["text"],
-                confidence=result["confidence"],
-                bounding_box=result["bounding_box"],
-                sequence_order=result.get("sequence_order"),
-            )
-            ocr_results.append(ocr_result)
-        
-        self.session.add_all(ocr_results)
-        await self.session.flush()
-        return ocr_results
+    ) -> int:
+        """Bulk create OCR results for a document.
+
+        OCR rows can be regenerated from the source file, so the enclosing
+        transaction commits with ``synchronous_commit = OFF``. Callers should
+        commit durable document updates before calling this.
+        """
+        rows = self._ocr_result_rows(document_id, results)
+        if not rows:
+            return 0
+
+        await self.session.execute(text("SET LOCAL synchronous_commit = OFF"))
+        await self.session.execute(insert(OCRResult), rows)
+        return len(rows)
 
     def create_ocr_results_sync(
         self,
         document_id: UUID,
         results: list[dict[str, Any]],
-    ) -> list[OCRResult]:
+    ) -> int:
         """Bulk create OCR results (sync version)."""
-        ocr_results = []
-        for result in results:
-            ocr_result = OCRResult(
-                document_id=document_id,
-                page_number=result.get("page_number", 1),
-                text=result["text"],
-                confidence=result["confidence"],
-                bounding_box=result["bounding_box"],
-                sequence_order=result.get("sequence_order"),
-            )
-            ocr_results.append(ocr_result)
-        
-        self.session.add_all(ocr_results)
-        self.session.flush()
-        return ocr_results
+        rows = self._ocr_result_rows(document_id, results)
+        if not rows:
+            return 0
+
+        self.session.execute(text("SET LOCAL synchronous_commit = OFF"))
+        self.session.execute(insert(OCRResult), rows)
+        return len(rows)
 
     # ============== Read Operations ==============
 
-    async def get_document(self, document_id: UUID) -> Document | None:
+    async def get_document_bare(self, document_id: UUID) -> Document | None:
+        """Get document row by ID without loading any relationships.
+
+        Relationship access on the returned instance raises instead of
+        issuing a lazy load, so callers needing related rows must use
+        ``get_document_full``.
+        """
+        result = await self.session.execute(
+            select(Document)
+            .options(raiseload("*"))
+            .where(Document.id == document_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_document_full(self, document_id: UUID) -> Document | None:
         """Get document by ID with relationships loaded."""
         result = await self.session.execute(
             select(Document)
@@ -187,7 +237,9 @@ class DocumentRepository:
 
     def get_document_sync(self, document_id: UUID) -> Document | None:
         """Get document by ID (sync version)."""
-        return self.session.query(Document).filter(Document.id == document_id).first()
+        return self.session.execute(
+            _DOCUMENT_BY_ID, {"document_id": document_id}
+        ).scalar_one_or_none()
 
     async def get_document_with_metadata(
         self,
@@ -209,6 +261,19 @@ class DocumentRepository:
         
         return document, metadata
 
+    @staticmethod
+    def _filter_documents(
+        query: Select,
+        status: DocumentStatus | None,
+        document_type: DocumentType | None,
+    ) -> Select:
+        """Apply the shared status/type filters to a document query."""
+        if status:
+            query = query.where(Document.status == status)
+        if document_type:
+            query = query.where(Document.document_type == document_type)
+        return query
+
     async def list_documents(
         self,
         status: DocumentStatus | None = None,
@@ -216,30 +281,69 @@ class DocumentRepository:
         page: int = 1,
         page_size: int = 20,
     ) -> tuple[list[Document], int]:
-        """List documents with filtering and pagination."""
-        query = select(Document)
-        count_query = select(func.count(Document.id))
-        
-        if status:
-            query = query.where(Document.status == status)
-            count_query = count_query.where(Document.status == status)
-        
-        if document_type:
-            query = query.where(Document.document_type == document_type)
-            count_query = count_query.where(Document.document_type == document_type)
-        
-        # Get total count
-        count_result = await self.session.execute(count_query)
-        total = count_result.scalar_one()
-        
-        # Apply pagination
-        query = query.order_by(Document.upload_timestamp.desc())
+        """List documents with filtering and pagination.
+
+        The total is folded into the page query via ``COUNT(*) OVER ()`` so
+        the filter predicate is only evaluated once per call.
+        """
+        query = self._filter_documents(
+            select(Document, func.count().over().label("total")).options(_LIST_COLUMNS),
+            status,
+            document_type,
+        )
+        query = query.order_by(Document.upload_timestamp.desc(), Document.id.desc())
         query = query.offset((page - 1) * page_size).limit(page_size)
-        
+
+        result = await self.session.execute(query)
+        rows = result.all()
+
+        if rows:
+            return [row.Document for row in rows], rows[0].total
+
+        if page == 1:
+            return [], 0
+
+        # Past the last page no row carries the window count, fall back
+        count_query = self._filter_documents(
+            select(func.count(Document.id)), status, document_type
+        )
+        count_result = await self.session.execute(count_query)
+        return [], count_result.scalar_one()
+
+    async def list_documents_after(
+        self,
+        cursor: tuple[datetime, UUID] | None = None,
+        status: DocumentStatus | None = None,
+        document_type: DocumentType | None = None,
+        page_size: int = 20,
+    ) -> tuple[list[Document], bool]:
+        """
+        List documents using keyset pagination.
+
+        Args:
+            cursor: ``(upload_timestamp, id)`` of the last document already seen
+            status: Filter by status
+            document_type: Filter by document type
+            page_size: Results per page
+
+        Returns:
+            Tuple of (documents, has_more)
+        """
+        query = self._filter_documents(
+            select(Document).options(_LIST_COLUMNS), status, document_type
+        )
+
+        if cursor:
+            query = query.where(tuple_(Document.upload_timestamp, Document.id) < cursor)
+
+        query = query.order_by(Document.upload_timestamp.desc(), Document.id.desc())
+        query = query.limit(page_size + 1)
+
         result = await self.session.execute(query)
         documents = list(result.scalars().all())
-        
-        return documents, total
+
+        has_more = len(documents) > page_size
+        return documents[:page_size], has_more
 
     async def get_documents_needing_review(
         self,
@@ -256,42 +360,59 @@ class DocumentRepository:
     async def get_ocr_results(
         self,
         document_id: UUID,
-    ) -> list[OCRResult]:
-        """Get OCR results for a document."""
-        result = await self.session.execute(
+        batch_size: int = 200,
+    ) -> AsyncIterator[OCRResult]:
+        """Stream OCR results for a document.
+
+        Rows come from a server-side cursor ``batch_size`` at a time, so
+        memory stays bounded for documents with many detections.
+        """
+        result = await self.session.stream_scalars(
             select(OCRResult)
             .where(OCRResult.document_id == document_id)
             .order_by(OCRResult.page_number, OCRResult.sequence_order)
+            .execution_options(yield_per=batch_size)
         )
-        return list(result.scalars().all())
+        async for ocr_result in result:
+            yield ocr_result
 
     # ============== Update Operations ==============
 
-    async def update_document_status(
-        self,
-        document_id: UUID,
+    @staticmethod
+    def _status_updates(
         status: DocumentStatus,
-        error_log: str | None = None,
-    ) -> Document | None:
-        """Update document status."""
+        error_log: str | None,
+    ) -> dict[str, Any]:
+        """Build the column updates for a status transition."""
         updates: dict[str, Any] = {"status": status}
         
+        # Timestamps come from the database clock, not the worker's, as naive
+        # UTC like the model's utcnow defaults whatever the session TimeZone
         if status == DocumentStatus.PROCESSING:
-            updates["processing_started_at"] = datetime.utcnow()
+            updates["processing_started_at"] = func.timezone("UTC", func.now())
         elif status in (DocumentStatus.COMPLETED, DocumentStatus.FAILED):
-            updates["processing_completed_at"] = datetime.utcnow()
+            updates["processing_completed_at"] = func.timezone("UTC", func.now())
         
         if error_log:
             updates["error_log"] = error_log
         
-        await self.session.execute(
+        return updates
+
+    async def update_document_status(
+        self,
+        document_id: UUID,
+        status: DocumentStatus,
+        error_log: str | None = None,
+    ) -> Document | None:
+        """Update document status."""
+        result = await self.session.execute(
             update(Document)
             .where(Document.id == document_id)
-            .values(**updates)
+            .values(**self._status_updates(status, error_log))
+            .returning(Document),
+            execution_options={"populate_existing": True},
         )
-        await self.session.flush()
-        
-        return await self.get_document(document_id)
+        return result.scalar_one_or_none()
 
     def update_document_status_sync(
         self,
@@ -300,22 +421,59 @@ class DocumentRepository:
         error_log: str | None = None,
     ) -> Document | None:
         """Update document status (sync version)."""
-        document = self.get_document_sync(document_id)
-        if not document:
-            return None
-        
-        document.status = status
-        
-        if status == DocumentStatus.PROCESSING:
-            document.processing_started_at = datetime.utcnow()
-        elif status in (DocumentStatus.COMPLETED, DocumentStatus.FAILED):
-            document.processing_completed_at = datetime.utcnow()
-        
-        if error_log:
-            document.error_log = error_log
-        
-        self.session.flush()
-        return document
+        result = self.session.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(**self._status_updates(status, error_log))
+            .returning(Document),
+            execution_options={"populate_existing": True},
+        )
+        return result.scalar_one_or_none()
+
+    def set_document_status_sync(
+        self,
+        document_id: UUID,
+        status: DocumentStatus,
+        error_log: str | None = None,
+    ) -> bool:
+        """Update document status without loading the row (sync version).
+
+        Returns:
+            True if the document exists
+        """
+        result = self.session.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(**self._status_updates(status, error_log)),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount > 0
+
+    def finalize_document_sync(
+        self,
+        document_id: UUID,
+        status: DocumentStatus,
+        document_type: DocumentType,
+        classification_confidence: float,
+        error_log: str | None = None,
+    ) -> Document | None:
+        """Write classification and final status in one statement (sync version).
+
+        Neither value depends on the other once the pipeline has finished, so
+        a single UPDATE ... RETURNING replaces two roundtrips.
+        """
+        updates = self._status_updates(status, error_log)
+        updates["document_type"] = document_type
+        updates["classification_confidence"] = classification_confidence
+
+        result = self.session.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(**updates)
+            .returning(Document),
+            execution_options={"populate_existing": True},
+        )
+        return result.scalar_one_or_none()
 
     async def update_document_ocr(
         self,
@@ -333,25 +491,15 @@ class DocumentRepository:
         if page_count:
             updates["page_count"] = page_count
         
-        # Update text search vector
+        # text_search_vector is a generated column and follows raw_text
         await self.session.execute(
             update(Document)
             .where(Document.id == document_id)
             .values(**updates)
         )
         
-        # Update text search vector separately (requires raw SQL for tsvector)
-        await self.session.execute(
-            text("""
-                UPDATE documents 
-                SET text_search_vector = to_tsvector('english', :text)
-                WHERE id = :doc_id
-            """),
-            {"text": raw_text, "doc_id": str(document_id)},
-        )
-        
         await self.session.flush()
-        return await self.get_document(document_id)
+        return await self.get_document_bare(document_id)
 
     def update_document_ocr_sync(
         self,
@@ -371,21 +519,13 @@ class DocumentRepository:
         if page_count:
             document.page_count = page_count
         
-        self.session.flush()
-        
-        # Update text search vector
-        self.session.execute(
-            text("""
-                UPDATE documents 
-                SET text_search_vector = to_tsvector('english', :text)
-                WHERE id = :doc_id
-            """),
-            {"text": raw_text, "doc_id": str(document_id)},
-        )
-        
         self.session.flush()
         return document
 
+    def refresh_document_terms_sync(self) -> None:
+        """Refresh the search-suggestion vocabulary (sync version)."""
+        self.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY document_terms"))
+
     async def update_document_classification(
         self,
         document_id: UUID,
@@ -402,7 +542,7 @@ class DocumentRepository:
             )
         )
         await self.session.flush()
-        return await self.get_document(document_id)
+        return await self.get_document_bare(document_id)
 
     def update_document_classification_sync(
         self,
@@ -448,7 +588,7 @@ class DocumentRepository:
 
     async def delete_document(self, document_id: UUID) -> bool:
         """Delete a document and all related records."""
-        document = await self.get_document(document_id)
+        document = await self.get_document_full(document_id)
         if not document:
             return False
         
@@ -20,6 +20,130 @@ class SearchService:
     Enables high-speed text search across all documents.
     """
 
+    # Optional filters bind NULL when unused, so each query has a single
+    # statement that SQLAlchemy and PostgreSQL can cache
+    _SEARCH_FILTERS = """
+        AND (CAST(:doc_type AS VARCHAR) IS NULL OR d.document_type = :doc_type)
+        AND (CAST(:status AS VARCHAR) IS NULL OR d.status = :status)
+        AND (CAST(:date_from AS TIMESTAMP) IS NULL OR d.upload_timestamp >= :date_from)
+        AND (CAST(:date_to AS TIMESTAMP) IS NULL OR d.upload_timestamp <= :date_to)
+    """
+
+    # Parse the tsquery once in a CTE; rank and count every hit, but only
+    # run ts_headline over the rows that survive LIMIT/OFFSET
+    _SEARCH_STMT = text(f"""
+        WITH q AS (
+            SELECT plainto_tsquery('english', :query) AS query
+        ),
+        hits AS (
+            SELECT 
+                d.id,
+                d.filename,
+                d.document_type,
+                d.status,
+                d.upload_timestamp,
+                d.ocr_confidence,
+                d.raw_text,
+                ts_rank(d.text_search_vector, q.query) as rank,
+                COUNT(*) OVER () as total
+            FROM 
+                documents d, q
+            WHERE 
+                d.text_search_vector @@ q.query
+                {_SEARCH_FILTERS}
+            ORDER BY rank DESC
+            LIMIT :limit OFFSET :offset
+        )
+        SELECT 
+            hits.id,
+            hits.filename,
+            hits.document_type,
+            hits.status,
+            hits.upload_timestamp,
+            hits.ocr_confidence,
+            hits.rank,
+            hits.total,
+            ts_headline(
+                'english',
+                hits.raw_text,
+                q.query,
+                'MaxWords=50, MinWords=20, StartSel=<mark>, StopSel=</mark>'
+            ) as snippet
+        FROM hits, q
+        ORDER BY hits.rank DESC
+    """)
+
+    _SEARCH_COUNT_STMT = text(f"""
+        SELECT COUNT(*) FROM documents d
+        WHERE d.text_search_vector @@ plainto_tsquery('english', :query)
+        {_SEARCH_FILTERS}
+    """)
+
+    # Use JSONB containment operator for flexible matching
+    _METADATA_SEARCH_STMT = text("""
+        SELECT 
+            d.id,
+            d.filename,
+            d.document_type,
+            d.status,
+            d.upload_timestamp,
+            em.data
+        FROM 
+            documents d
+        JOIN 
+            extracted_metadata em ON d.id = em.document_id
+        WHERE 
+            em.data->>:field ILIKE :value
+        ORDER BY d.upload_timestamp DESC
+        LIMIT :limit OFFSET :offset
+    """)
+
+    _METADATA_COUNT_STMT = text("""
+        SELECT COUNT(*) FROM extracted_metadata em
+        WHERE em.data->>:field ILIKE :value
+    """)
+
+    _AMOUNT_FILTERS = """
+        em.data ? :field
+        AND (CAST(:min_amount AS NUMERIC) IS NULL
+             OR (em.data->>:field)::numeric >= :min_amount)
+        AND (CAST(:max_amount AS NUMERIC) IS NULL
+             OR (em.data->>:field)::numeric <= :max_amount)
+    """
+
+    _AMOUNT_SEARCH_STMT = text(f"""
+        SELECT 
+            d.id,
+            d.filename,
+            d.document_type,
+            d.status,
+            d.upload_timestamp,
+            em.data
+        FROM 
+            documents d
+        JOIN 
+            extracted_metadata em ON d.id = em.document_id
+        WHERE 
+            {_AMOUNT_FILTERS}
+        ORDER BY (em.data->>:field)::numeric DESC
+        LIMIT :limit OFFSET :offset
+    """)
+
+    _AMOUNT_COUNT_STMT = text(f"""
+        SELECT COUNT(*) FROM extracted_metadata em
+        WHERE {_AMOUNT_FILTERS}
+    """)
+
+    # Prefix range scan over the document_terms vocabulary view; words are
+    # already lowercased and stripped of punctuation by the view
+    _SUGGESTIONS_STMT = text("""
+        SELECT word
+        FROM document_terms
+        WHERE word LIKE :prefix
+        ORDER BY df DESC
+        LIMIT :limit
+    """)
+
     def __init__(self, session: AsyncSession):
         """Initialize search service with database session."""
         self.session = session
@@ -52,73 +176,28 @@ class SearchService:
         if not query or not query.strip():
             return [], 0
 
-        # Build the search query using plainto_tsquery for natural language
-        # or to_tsquery for advanced syntax
-        search_query = """
-            SELECT 
-                d.id,
-                d.filename,
-                d.document_type,
-                d.status,
-                d.upload_timestamp,
-                d.ocr_confidence,
-                ts_rank(d.text_search_vector, query) as rank,
-                ts_headline(
-                    'english',
-                    d.raw_text,
-                    query,
-                    'MaxWords=50, MinWords=20, StartSel=<mark>, StopSel=</mark>'
-                ) as snippet
-            FROM 
-                documents d,
-                plainto_tsquery('english', :query) query
-            WHERE 
-                d.text_search_vector @@ query
-        """
-
-        params: dict[str, Any] = {"query": query}
-        count_conditions = "d.text_search_vector @@ plainto_tsquery('english', :query)"
-
-        # Add filters
-        if document_type:
-            search_query += " AND d.document_type = :doc_type"
-            count_conditions += " AND d.document_type = :doc_type"
-            params["doc_type"] = document_type.value
-
-        if status:
-            search_query += " AND d.status = :status"
-            count_conditions += " AND d.status = :status"
-            params["status"] = status.value
-
-        if date_from:
-            search_query += " AND d.upload_timestamp >= :date_from"
-            count_conditions += " AND d.upload_timestamp >= :date_from"
-            params["date_from"] = date_from
-
-        if date_to:
-            search_query += " AND d.upload_timestamp <= :date_to"
-            count_conditions += " AND d.upload_timestamp <= :date_to"
-            params["date_to"] = date_to
-
-        # Order by relevance rank
-        search_query += " ORDER BY rank DESC"
-
-        # Add pagination
-        search_query += " LIMIT :limit OFFSET :offset"
-        params["limit"] = page_size
-        params["offset"] = (page - 1) * page_size
+        params: dict[str, Any] = {
+            "query": query,
+            "doc_type": document_type.value if document_type else None,
+            "status": status.value if status else None,
+            "date_from": date_from,
+            "date_to": date_to,
+            "limit": page_size,
+            "offset": (page - 1) * page_size,
+        }
 
         # Execute search
-        result = await self.session.execute(text(search_query), params)
+        result = await self.session.execute(self._SEARCH_STMT, params)
         rows = result.fetchall()
 
-        # Get total count
-        count_query = f"""
-            SELECT COUNT(*) FROM documents d
-            WHERE {count_conditions}
-        """
-        count_result = await self.session.execute(text(count_query), params)
-        total = count_result.scalar_one()
+        if rows:
+            total = rows[0].total
+        elif page == 1:
+            total = 0
+        else:
+            # Past the last page no row carries the window count, fall back
+            count_result = await self.session.execute(self._SEARCH_COUNT_STMT, params)
+            total = count_result.scalar_one()
 
         # Format results
         search_results = []
@@ -155,25 +234,6 @@ class SearchService:
         Returns:
             Tuple of (results, total count)
         """
-        # Use JSONB containment operator for flexible matching
-        search_query = """
-            SELECT 
-                d.id,
-                d.filename,
-                d.document_type,
-                d.status,
-                d.upload_timestamp,
-                em.data
-            FROM 
-                documents d
-            JOIN 
-                extracted_metadata em ON d.id = em.document_id
-            WHERE 
-                em.data->>:field ILIKE :value
-            ORDER BY d.upload_timestamp DESC
-            LIMIT :limit OFFSET :offset
-        """
-
         params = {
             "field": field,
             "value": f"%{value}%",
@@ -181,16 +241,12 @@ class SearchService:
             "offset": (page - 1) * page_size,
         }
 
-        result = await self.session.execute(text(search_query), params)
+        result = await self.session.execute(self._METADATA_SEARCH_STMT, params)
         rows = result.fetchall()
 
         # Get total count
-        count_query = """
-            SELECT COUNT(*) FROM extracted_metadata em
-            WHERE em.data->>:field ILIKE :value
-        """
         count_result = await self.session.execute(
-            text(count_query),
+            self._METADATA_COUNT_STMT,
             {"field": field, "value": f"%{value}%"},
         )
         total = count_result.scalar_one()
@@ -229,51 +285,20 @@ class SearchService:
         Returns:
             Tuple of (results, total count)
         """
-        conditions = []
         params: dict[str, Any] = {
             "field": amount_field,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
             "limit": page_size,
             "offset": (page - 1) * page_size,
         }
 
-        if min_amount is not None:
-            conditions.append("(em.data->>:field)::numeric >= :min_amount")
-            params["min_amount"] = min_amount
-
-        if max_amount is not None:
-            conditions.append("(em.data->>:field)::numeric <= :max_amount")
-            params["max_amount"] = max_amount
-
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-        search_query = f"""
-            SELECT 
-                d.id,
-                d.filename,
-                d.document_type,
-                d.status,
-                d.upload_timestamp,
-                em.data
-            FROM 
-                documents d
-            JOIN 
-                extracted_metadata em ON d.id = em.document_id
-            WHERE 
-                em.data ? :field AND {where_clause}
-            ORDER BY (em.data->>:field)::numeric DESC
-            LIMIT :limit OFFSET :offset
-        """
-
-        result = await self.session.execute(text(search_query), params)
+        result = await self.session.execute(self._AMOUNT_SEARCH_STMT, params)
         rows = result.fetchall()
 
         # Get total count
-        count_query = f"""
-            SELECT COUNT(*) FROM extracted_metadata em
-            WHERE em.data ? :field AND {where_clause}
-        """
         count_params = {k: v for k, v in params.items() if k not in ("limit", "offset")}
-        count_result = await self.session.execute(text(count_query), count_params)
+        count_result = await self.session.execute(self._AMOUNT_COUNT_STMT, count_params)
         total = count_result.scalar_one()
 
         results = []
@@ -304,33 +329,16 @@ class SearchService:
         Returns:
             List of suggested search terms
         """
-        # Extract unique words from documents matching the partial query
-        query = """
-            SELECT DISTINCT unnest(string_to_array(raw_text, ' ')) as word
-            FROM documents
-            WHERE raw_text ILIKE :pattern
-            LIMIT :limit
-        """
+        prefix = (
+            partial_query.strip()
+            .lower()
+            .replace("\\", "\\\\")
+            .replace("%", "\\%")
+            .replace("_", "\\_")
+        )
 
         result = await self.session.execute(
-            text(query),
-            {"pattern": f"%{partial_query}%", "limit": limit * 5},
+            self._SUGGESTIONS_STMT,
+            {"prefix": f"{prefix}%", "limit": limit},
         )
-        words = [row.word for row in result.fetchall()]
-
-        # Filter and clean suggestions
-        suggestions = []
-        seen = set()
-        for word in words:
-            cleaned = word.strip(".,!?;:\"'()[]{}").lower()
-            if (
-                len(cleaned) >= 3
-                and cleaned.startswith(partial_query.lower())
-                and cleaned not in seen
-            ):
-                suggestions.append(cleaned)
-                seen.add(cleaned)
-            if len(suggestions) >= limit:
-                break
-
-        return suggestions
+        return [row.word for row in result.fetchall()]
@@ -1,6 +1,9 @@
 """OCR Verification Services - Image Reconstruction & Comparison."""
 
+import functools
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
@@ -8,10 +11,130 @@ import cv2
 import numpy as np
 from numpy.typing import NDArray
 from PIL import Image, ImageDraw, ImageFont
-from skimage.metrics import structural_similarity as ssim
+from rapidfuzz.distance import Levenshtein
 
 logger = logging.getLogger(__name__)
 
+# SSIM constants for 8-bit images (Wang et al. 2004, K1=0.01, K2=0.03)
+_SSIM_WIN_SIZE = 7
+_SSIM_GAUSSIAN_WIN_SIZE = 11
+_SSIM_GAUSSIAN_SIGMA = 1.5
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+
+
+@functools.lru_cache(maxsize=512)
+def _load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Open a TrueType face once per (path, size)."""
+    return ImageFont.truetype(path, size)
+
+
+# (text, font size, bold, RGBA fill, vertical)
+_TileKey = tuple[str, int, bool, tuple[int, ...], bool]
+
+
+def _render_text_tile(
+    font: ImageFont.FreeTypeFont,
+    text: str,
+    fill: tuple[int, ...],
+    vertical: bool,
+) -> Image.Image:
+    """Rasterize text into a tightly cropped RGBA tile, rotated for vertical text."""
+    left, top, right, bottom = font.getbbox(text)
+    tile = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    ImageDraw.Draw(tile).text((-left, -top), text, font=font, fill=fill)
+    return tile.rotate(90, expand=True) if vertical else tile
+
+
+def _levenshtein_ratio(s1: str, s2: str, score_cutoff: float | None = None) -> float:
+    """
+    Normalized Levenshtein similarity (1 - distance / longest length).
+    
+    With ``score_cutoff``, scores below the cutoff are returned as 0.0 and the
+    distance computation may stop early once the cutoff is out of reach.
+    """
+    if not s1 or not s2:
+        return 0.0
+    return Levenshtein.normalized_similarity(s1, s2, score_cutoff=score_cutoff)
+
+
+def _fast_ssim(
+    a: NDArray[np.uint8],
+    b: NDArray[np.uint8],
+    need_quality_map: bool = False,
+    exact_wang: bool = False,
+) -> tuple[float, NDArray[np.float32] | None]:
+    """
+    Mean SSIM of two 8-bit grayscale images.
+    
+    By default matches skimage's ``structural_similarity`` defaults (7x7
+    uniform window, sample covariance, reflected borders) using separable
+    float32 box filters instead of float64 ndimage convolutions. With
+    ``exact_wang`` the original 11x11 Gaussian window (sigma=1.5, population
+    covariance) from Wang et al. is used instead.
+    
+    Returns:
+        Tuple of (mean SSIM, SSIM map or None)
+    """
+    if exact_wang:
+        win_size = _SSIM_GAUSSIAN_WIN_SIZE
+        cov_norm = 1.0
+        
+        def blur(x: NDArray[np.float32]) -> NDArray[np.float32]:
+            return cv2.GaussianBlur(
+                x, (win_size, win_size), _SSIM_GAUSSIAN_SIGMA, borderType=cv2.BORDER_REFLECT
+            )
+    else:
+        win_size = _SSIM_WIN_SIZE
+        cov_norm = win_size**2 / (win_size**2 - 1)
+        
+        def blur(x: NDArray[np.float32]) -> NDArray[np.float32]:
+            return cv2.boxFilter(
+                x, cv2.CV_32F, (win_size, win_size), borderType=cv2.BORDER_REFLECT
+            )
+    
+    b_min, b_max, _, _ = cv2.minMaxLoc(b)
+    if b_min == b_max:
+        # Constant second image (e.g. a blank reconstruction): its local mean
+        # is the constant and its variance and covariance are zero, so only
+        # the first image needs filtering. Centering on the constant keeps
+        # the float32 variance free of cancellation error.
+        uy = np.float32(b_min)
+        d = a.astype(np.float32) - uy
+        ud = blur(d)
+        ux = ud + uy
+        vx = cov_norm * (blur(d * d) - ud * ud)
+        
+        ssim_map = ((2 * uy * ux + _SSIM_C1) * _SSIM_C2) / (
+            (ux * ux + uy * uy + _SSIM_C1) * (vx + _SSIM_C2)
+        )
+    else:
+        x = a.astype(np.float32)
+        y = b.astype(np.float32)
+        
+        ux, uy = blur(x), blur(y)
+        ux_uy = ux * uy
+        ux_sq = ux * ux
+        uy_sq = uy * uy
+        
+        vx = cov_norm * (blur(x * x) - ux_sq)
+        vy = cov_norm * (blur(y * y) - uy_sq)
+        vxy = cov_norm * (blur(x * y) - ux_uy)
+        
+        ssim_map = ((2 * ux_uy + _SSIM_C1) * (2 * vxy + _SSIM_C2)) / (
+            (ux_sq + uy_sq + _SSIM_C1) * (vx + vy + _SSIM_C2)
+        )
+    
+    # Ignore the border where the window overhangs the image, unless the
+    # image is narrower than the window and the border is all there is
+    if min(ssim_map.shape) < win_size:
+        score = float(ssim_map.mean(dtype=np.float64))
+    else:
+        pad = (win_size - 1) // 2
+        score = float(ssim_map[pad:-pad, pad:-pad].mean(dtype=np.float64))
+    
+    return score, ssim_map if need_quality_map else None
+
 
 @dataclass
 class VerificationResult:
@@ -39,6 +162,18 @@ class ImageReconstructionService:
     def __init__(self):
         self.default_font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
         self.fallback_font_path = "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf"
+        self._regular_font_path = self._resolve_font_path([
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
+            self.default_font_path,
+        ])
+        self._bold_font_path = self._resolve_font_path([
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+            "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
+            self.default_font_path,
+        ])
     
     def reconstruct(
         self,
@@ -63,31 +198,28 @@ class ImageReconstructionService:
         channels = original_shape[2] if len(original_shape) > 2 else 3
         
         # Super-sampling factor for smoother text (antialiasing)
-        scale = 3
+        scale = 2
         s_width, s_height = width * scale, height * scale
         
-        # Super-sampling factor for smoother text (antialiasing)
-        scale = 3
-        s_width, s_height = width * scale, height * scale
-        
-        # Smart Ghosting: Use VERY FADED original as background for alignment verification
-        # The reconstruction is primarily OCR TEXT - the ghost is just a subtle alignment guide
+        # Text is rendered onto a plain canvas; when an original is given it is
+        # ghosted in after downsampling, since the faint ghost gains nothing
+        # from super-sampling
         if original_image is not None:
-            # Convert original to PIL and resize to super-sampled size
-            orig_pil = Image.fromarray(cv2.cvtColor(original_image, cv2.COLOR_BGR2RGB))
-            base_image = orig_pil.resize((s_width, s_height), Image.Resampling.LANCZOS)
-            base_image = base_image.convert("RGBA")
-            # Apply VERY LOW transparency (alpha=40) - ghost is barely visible
-            # This ensures OCR text is clearly the primary content, not the original image
-            base_image.putalpha(40)
-            # Create final canvas with white background + very faint ghosted overlay
-            img = Image.new("RGBA", (s_width, s_height), (255, 255, 255, 255))
-            img.alpha_composite(base_image)
+            img = Image.new("RGB", (s_width, s_height), (255, 255, 255))
         else:
             # Fallback to plain background
-            img = Image.new("RGBA", (s_width, s_height), background_color + (255,))
+            img = Image.new("RGB", (s_width, s_height), background_color)
         draw = ImageDraw.Draw(img)
         
+        # Shrink-to-fit measures the same strings at the same sizes repeatedly
+        text_widths: dict[tuple[str, int, bool], float] = {}
+        
+        def text_length(text: str, size: int, bold: bool) -> float:
+            key = (text, size, bold)
+            if key not in text_widths:
+                text_widths[key] = draw.textlength(text, font=self._get_font(size, bold))
+            return text_widths[key]
+        
         # --- Spatial NMS with Proximity Awareness ---
         # Only remove duplicates if they have BOTH similar text AND close proximity
         # This preserves legitimate instances of same text in different locations
@@ -115,196 +247,126 @@ class ImageReconstructionService:
         
         detections = valid_detections
         
-        def get_conf(d): return d.get("confidence", 0)
-        detections_conf_sorted = sorted(detections, key=get_conf, reverse=True)
-        
-        accepted_detections = []
-        
-        # Levenshtein distance helper for text similarity
-        def levenshtein_ratio(s1, s2):
-            if not s1 or not s2: return 0.0
-            rows = len(s1)+1
-            cols = len(s2)+1
-            dist = [[0 for x in range(cols)] for x in range(rows)]
-            for i in range(1, rows): dist[i][0] = i
-            for i in range(1, cols): dist[0][i] = i
-            for col in range(1, cols):
-                for row in range(1, rows):
-                    cost = 0 if s1[row-1] == s2[col-1] else 1
-                    dist[row][col] = min(dist[row-1][col] + 1,      # deletion
-                                         dist[row][col-1] + 1,      # insertion
-                                         dist[row-1][col-1] + cost) # substitution
-            max_len = max(len(s1), len(s2))
-            return 1 - (dist[rows-1][cols-1] / max_len)
-
-        for cand in detections_conf_sorted:
-            cand_bbox = cand.get("bounding_box") or cand.get("box")
-            cand_text = cand.get("text", "").strip().lower()
-            if not cand_bbox or not isinstance(cand_bbox, list) or len(cand_bbox) < 4:
+        # Box geometry for every detection, computed once up front so each
+        # NMS candidate is tested against all kept boxes in one NumPy pass
+        boxes = np.empty((len(detections), 4), dtype=np.float64)
+        centers = np.empty((len(detections), 2), dtype=np.float64)
+        for i, det in enumerate(detections):
+            bbox = det.get("bounding_box") or det.get("box")
+            xs = [p[0] for p in bbox]
+            ys = [p[1] for p in bbox]
+            boxes[i] = (min(xs), min(ys), max(xs), max(ys))
+            centers[i] = (sum(xs) / len(xs), sum(ys) / len(ys))
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        texts = [det.get("text", "").strip().lower() for det in detections]
+        confs = np.array([det.get("confidence", 0) for det in detections], dtype=np.float64)
+        
+        accepted: list[int] = []
+        
+        for cand in np.argsort(-confs, kind="stable"):
+            cand_area = areas[cand]
+            if cand_area <= 0:
                 continue
-                
-            # Calc Candidate Geometry
-            xs = [p[0] for p in cand_bbox]
-            ys = [p[1] for p in cand_bbox]
-            cand_area = (max(xs) - min(xs)) * (max(ys) - min(ys))
-            if cand_area <= 0: continue
             
-            cand_cx = sum(xs) / len(xs)
-            cand_cy = sum(ys) / len(ys)
-            
-            is_bad = False
-            for kept in accepted_detections:
-                kept_bbox = kept.get("bounding_box") or kept.get("box")
-                kept_text = kept.get("text", "").strip().lower()
-                
-                k_xs = [p[0] for p in kept_bbox]
-                k_ys = [p[1] for p in kept_bbox]
-                kept_area = (max(k_xs) - min(k_xs)) * (max(k_ys) - min(k_ys))
-                
-                k_cx = sum(k_xs) / len(k_xs)
-                k_cy = sum(k_ys) / len(k_ys)
-                
-                # Calculate spatial distance between centers
-                distance = ((cand_cx - k_cx)**2 + (cand_cy - k_cy)**2)**0.5
+            if accepted:
+                kept = np.array(accepted)
+                kept_boxes = boxes[kept]
+                kept_areas = areas[kept]
                 
                 # Intersection for IoU
-                inter_x1 = max(min(xs), min(k_xs))
-                inter_y1 = max(min(ys), min(k_ys))
-                inter_x2 = min(max(xs), max(k_xs))
-                inter_y2 = min(max(ys), max(k_ys))
-                
-                has_intersection = inter_x2 > inter_x1 and inter_y2 > inter_y1
+                inter_w = (
+                    np.minimum(boxes[cand, 2], kept_boxes[:, 2])
+                    - np.maximum(boxes[cand, 0], kept_boxes[:, 0])
+                )
+                inter_h = (
+                    np.minimum(boxes[cand, 3], kept_boxes[:, 3])
+                    - np.maximum(boxes[cand, 1], kept_boxes[:, 1])
+                )
+                has_intersection = (inter_w > 0) & (inter_h > 0)
+                inter_area = np.where(has_intersection, inter_w * inter_h, 0.0)
+                iou = inter_area / (cand_area + kept_areas - inter_area)
                 
-                if has_intersection:
-                    inter_area = (inter_x2 - inter_x1) * (inter_y2 - inter_y1)
-                    union_area = cand_area + kept_area - inter_area
-                    iou = inter_area / union_area if union_area > 0 else 0
-                else:
-                    iou = 0
-                    inter_area = 0
-                
-                # Text similarity
-                text_sim = levenshtein_ratio(cand_text, kept_text)
+                # RULE 2: Geometric Overlap (significant IoU regardless of text)
+                # RULE 3: Containment (candidate contains kept box, watermark removal)
+                # RULE 4: Inside (candidate inside kept box, noise removal)
+                if (
+                    (iou > 0.20)
+                    | (inter_area / kept_areas > 0.80)
+                    | (inter_area / cand_area > 0.80)
+                ).any():
+                    continue
                 
                 # RULE 1: Text Duplicate (only if spatially close)
                 # Remove if text is very similar (>90%) AND boxes are close (distance < 50 OR any overlap)
-                if text_sim > 0.90 and (distance < 50 or iou > 0.01):
-                    is_bad = True
-                    break
-                
-                # RULE 2: Geometric Overlap (significant IoU regardless of text)
-                # Remove if boxes overlap significantly (>20% IoU)
-                if iou > 0.20:
-                    is_bad = True
-                    break
-                
-                # RULE 3: Containment (watermark removal)
-                # If candidate CONTAINS kept box (intersection ~= kept area)
-                if has_intersection and inter_area / kept_area > 0.80:
-                    is_bad = True
-                    break
-                    
-                # RULE 4: Inside (noise removal)
-                # If candidate is INSIDE kept box (intersection ~= cand area)
-                if has_intersection and inter_area / cand_area > 0.80:
-                    is_bad = True
-                    break
+                distance = np.hypot(*(centers[kept] - centers[cand]).T)
+                close = kept[(distance < 50) | (iou > 0.01)]
+                if any(
+                    _levenshtein_ratio(texts[cand], texts[k], score_cutoff=0.90) > 0.90
+                    for k in close
+                ):
+                    continue
             
-            if not is_bad:
-                accepted_detections.append(cand)
+            accepted.append(int(cand))
+        
+        # Confidence as seen by the watermark and opacity heuristics
+        # (missing confidence is trusted here, unlike in NMS ranking)
+        style_confs = np.array(
+            [det.get("confidence", 1.0) for det in detections], dtype=np.float64
+        )
 
         # Re-sort accepted detections by Area (Z-Order) for drawing
         # Background first (if any large ones survived), Foreground last
-        def get_detection_area(det):
-            bbox = det.get("bounding_box") or det.get("box")
-            if isinstance(bbox, list) and len(bbox) >= 4:
-                xs = [p[0] for p in bbox]
-                ys = [p[1] for p in bbox]
-                return (max(xs) - min(xs)) * (max(ys) - min(ys))
-            return 0
-            
-        detections_drawing_order = sorted(accepted_detections, key=get_detection_area, reverse=True)
+        accepted_idx = np.array(accepted, dtype=np.intp)
+        drawing_order = accepted_idx[np.argsort(-areas[accepted_idx], kind="stable")]
         
         # --- Enhanced Watermark Detection ---
-        # Identify and filter watermarks using multiple heuristics
-        def is_likely_watermark(det, img_width, img_height):
-            """Detect watermarks using combined heuristics"""
-            bbox = det.get("bounding_box") or det.get("box")
-            if not bbox or len(bbox) < 4:
-                return False
-                
-            xs = [p[0] for p in bbox]
-            ys = [p[1] for p in bbox]
-            width = max(xs) - min(xs)
-            height = max(ys) - min(ys)
-            area = width * height
-            conf = det.get("confidence", 1.0)
-            text = det.get("text", "").strip()
-            
+        # Identify and filter watermarks using multiple heuristics, evaluated
+        # for every drawable detection at once
+        wm_areas = areas[drawing_order]
+        wm_confs = style_confs[drawing_order]
+        wm_text_lens = np.array([len(texts[i]) for i in drawing_order])
+        half_size = np.array([width / 2, height / 2])
+        center_ratio = np.abs(centers[drawing_order] - half_size) / half_size
+        is_watermark = (
             # Heuristic 1: Very large area + low confidence
-            if area > 20000 and conf < 0.85:
-                return True
-            
+            ((wm_areas > 20000) & (wm_confs < 0.85))
             # Heuristic 2: Large area + very low confidence
-            if area > 10000 and conf < 0.70:
-                return True
-                
+            | ((wm_areas > 10000) & (wm_confs < 0.70))
             # Heuristic 3: Low text density (few characters for large area)
-            if area > 5000 and len(text) < 5:
-                return True
-            
+            | ((wm_areas > 5000) & (wm_text_lens < 5))
             # Heuristic 4: Centered large text (typical watermark position)
-            cx = sum(xs) / len(xs)
-            cy = sum(ys) / len(ys)
-            center_ratio_x = abs(cx - img_width/2) / (img_width/2)
-            center_ratio_y = abs(cy - img_height/2) / (img_height/2)
-            if area > 15000 and conf < 0.90 and center_ratio_x < 0.3 and center_ratio_y < 0.3:
-                return True
-                
-            return False
+            | (
+                (wm_areas > 15000)
+                & (wm_confs < 0.90)
+                & (center_ratio[:, 0] < 0.3)
+                & (center_ratio[:, 1] < 0.3)
+            )
+        )
         
         # Filter out watermarks
-        non_watermark_detections = []
-        for det in detections_drawing_order:
-            if not is_likely_watermark(det, width, height):
-                non_watermark_detections.append(det)
-        
-        detections_drawing_order = non_watermark_detections
+        drawing_order = drawing_order[~is_watermark]
         
         # --- Dynamic Per-Box Font Sizing ---
         # Font size is calculated individually for each text box based on its height
         # This ensures headers get large fonts and labels get small fonts
         
-        for det in detections_drawing_order:
-            text = det.get("text", "")
-            bbox = det.get("bounding_box") or det.get("box")
-            
-            if not text or not bbox:
-                continue
+        # Layout pass: style and font size per box, keyed by the tile it needs
+        placements: list[tuple[_TileKey, float, float, float, float]] = []
+        
+        for i in drawing_order:
+            text = detections[i]["text"]
             
             try:
-                # 1. Parse Bounding Box
-                if isinstance(bbox, list) and len(bbox) >= 4:
-                    # Polygon format: [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-                    # Determine orientation
-                    x_coords = [p[0] for p in bbox]
-                    y_coords = [p[1] for p in bbox]
-                    # Scaled coordinates for drawing
-                    scaled_bbox = [[p[0] * scale, p[1] * scale] for p in bbox]
-                    s_x = [p[0] for p in scaled_bbox]
-                    s_y = [p[1] for p in scaled_bbox]
-                    s_min_x, s_min_y = min(s_x), min(s_y)
-                    s_box_w = max(s_x) - s_min_x
-                    s_box_h = max(s_y) - s_min_y
-                    
-                    is_vertical = s_box_h > s_box_w * 1.5
-                    
-                    # Unscaled crop coordinates for color sampling
-                    oy1, oy2 = max(0, int(min(y_coords))), min(height, int(max(y_coords)))
-                    ox1, ox2 = max(0, int(min(x_coords))), min(width, int(max(x_coords)))
-                    
-                else:
-                    continue
+                # 1. Box geometry (scaled for drawing, unscaled for color sampling)
+                min_x, min_y, max_x, max_y = boxes[i].tolist()
+                s_min_x, s_min_y = min_x * scale, min_y * scale
+                s_box_w = (max_x - min_x) * scale
+                s_box_h = (max_y - min_y) * scale
+                
+                is_vertical = s_box_h > s_box_w * 1.5
+                
+                oy1, oy2 = max(0, int(min_y)), min(height, int(max_y))
+                ox1, ox2 = max(0, int(min_x)), min(width, int(max_x))
                 
                 # 2. Extract Style Info (Color & Boldness)
                 fill_color = (0, 0, 0)
@@ -314,20 +376,20 @@ class ImageReconstructionService:
                     crop = original_image[oy1:oy2, ox1:ox2]
                     if crop.size > 0:
                         # Color: simple dominant dark color
-                        reshaped = crop.reshape(-1, 3)
                         # Assume text is darker than background (typical for documents)
                         # Get pixels with luminance < 180 (heuristic)
                         if channels == 3:
-                            lum = 0.299*reshaped[:,2] + 0.587*reshaped[:,1] + 0.114*reshaped[:,0]
-                            dark_mask = lum < 180
-                            if dark_mask.any():
-                                mean_color = reshaped[dark_mask].mean(axis=0)
+                            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+                            dark_mask = (gray < 180).view(np.uint8)
+                            n_dark = cv2.countNonZero(dark_mask)
+                            if n_dark:
+                                b, g, r, _ = cv2.mean(crop, mask=dark_mask)
                                 # OpenCV BGR -> PIL RGB
-                                fill_color = (int(mean_color[2]), int(mean_color[1]), int(mean_color[0]))
+                                fill_color = (int(r), int(g), int(b))
                             
                             # Boldness: High pixel density of dark pixels?
                             # Density = dark_pixels / total_pixels
-                            density = np.count_nonzero(dark_mask) / len(dark_mask) if len(dark_mask) > 0 else 0
+                            density = n_dark / gray.size
                             # Heuristic: Density > 0.35 implies thick/bold font for text regions
                             if density > 0.35:
                                 is_bold = True
@@ -335,7 +397,7 @@ class ImageReconstructionService:
                 # Determine opacity
                 alpha = 255
                 det_area = s_box_w * s_box_h
-                conf = det.get("confidence", 1.0)
+                conf = style_confs[i]
                 # Keep watermark logic just in case, though NMS helps
                 if det_area > (15000 * scale * scale) and conf < 0.85:
                     alpha = 40 
@@ -351,93 +413,118 @@ class ImageReconstructionService:
                 if font_size > 200:
                     font_size = 200  # Sanity cap for huge boxes
                 
-                # Load font for this specific size
-                current_font = self._get_font(font_size, is_bold)
-                
                 # Width Fitting: Shrink font if text overflows box width
                 if is_vertical:
                     constraint = s_box_h  # For vertical text, height is the "width"
                 else:
                     constraint = s_box_w
                 
-                text_len = draw.textlength(text, font=current_font)
-                while text_len > constraint * 0.95 and font_size > 8:
+                # Text width is ~linear in font size, so jump straight to the
+                # estimated fit and only step by one for rounding
+                target_len = constraint * 0.95
+                text_len = text_length(text, font_size, is_bold)
+                if text_len > target_len and font_size > 8:
+                    max_size = font_size - 1
+                    font_size = max(8, min(max_size, int(font_size * target_len / text_len)))
+                    text_len = text_length(text, font_size, is_bold)
+                    while (
+                        text_len <= target_len
+                        and font_size < max_size
+                        and text_length(text, font_size + 1, is_bold) <= target_len
+                    ):
+                        font_size += 1
+                        text_len = text_length(text, font_size, is_bold)
+                while text_len > target_len and font_size > 8:
                     font_size -= 1
-                    current_font = self._get_font(font_size, is_bold)
-                    text_len = draw.textlength(text, font=current_font)
-                
-                if is_vertical:
-                    # Create temporary image for text
-                    text_bbox = draw.textbbox((0, 0), text, font=current_font)
-                    tw, th = text_bbox[2] - text_bbox[0], text_bbox[3] - text_bbox[1]
-                    
-                    txt_img = Image.new('RGBA', (tw + 10, th + 10), (0,0,0,0))
-                    txt_draw = ImageDraw.Draw(txt_img)
-                    txt_draw.text((0, 0), text, font=current_font, fill=fill_color + (alpha,))
-                    
-                    rotated = txt_img.rotate(90, expand=True)
-                    
-                    # Center in box
-                    rw, rh = rotated.size
-                    paste_x = int(s_min_x + (s_box_w - rw) / 2)
-                    paste_y = int(s_min_y + (s_box_h - rh) / 2)
-                    
-                    img.paste(rotated, (paste_x, paste_y), rotated)
-                    
-                else:
-                    # Standard horizontal draw
-                    text_bbox = draw.textbbox((0, 0), text, font=safety_font)
-                    th = text_bbox[3] - text_bbox[1]
-                    tw = text_bbox[2] - text_bbox[0]
-                    
-                    # Center vertically, left align horizontally
-                    text_x = s_min_x + 2  # Small padding
-                    text_y = s_min_y + (s_box_h - th) / 2
-                    
-                    draw.text((text_x, text_y), text, font=safety_font, fill=fill_color)
+                    text_len = text_length(text, font_size, is_bold)
+                placements.append((
+                    (text, font_size, is_bold, fill_color + (alpha,), is_vertical),
+                    s_min_x, s_min_y, s_box_w, s_box_h,
+                ))
             
             except Exception as e:
-                logger.debug(f"Failed to render text '{text[:20]}...': {e}")
+                logger.debug(f"Failed to lay out text '{text[:20]}...': {e}")
                 continue
         
-        # Downsample to original size with high-quality resampling
-        final_img = img.resize((width, height), Image.Resampling.LANCZOS)
-        
-        # Convert PIL Image to numpy array for consistency
-        final_array = np.array(final_img)
-        # Convert RGBA to BGR if needed (standard OpenCV format)
-        if final_array.shape[2] == 4:  # RGBA
-            final_array = cv2.cvtColor(final_array, cv2.COLOR_RGBA2BGR)
-        elif final_array.shape[2] == 3:  # RGB
-            final_array = cv2.cvtColor(final_array, cv2.COLOR_RGB2BGR)
-        
-        return final_array
-    
-    def _get_font(self, size: int, is_bold: bool = False) -> ImageFont.FreeTypeFont:
-        """Get font with fallback, supporting bold weight."""
-        fonts_to_try = []
-        
-        if is_bold:
-            fonts_to_try.extend([
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
-            ])
+        # Rasterize each unique tile once on a thread pool. Work is split per
+        # font face because FreeType faces must not be shared between threads
+        font_groups: dict[tuple[int, bool], dict[_TileKey, None]] = {}
+        for key, *_ in placements:
+            font_groups.setdefault((key[1], key[2]), {})[key] = None
+        
+        def render_group(keys: dict[_TileKey, None]) -> dict[_TileKey, Image.Image]:
+            tiles = {}
+            for key in keys:
+                text, size, bold, fill, vertical = key
+                try:
+                    tiles[key] = _render_text_tile(self._get_font(size, bold), text, fill, vertical)
+                except Exception as e:
+                    logger.debug(f"Failed to render text '{text[:20]}...': {e}")
+            return tiles
+        
+        text_tiles: dict[_TileKey, Image.Image] = {}
+        workers = min(len(font_groups), os.cpu_count() or 1)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for tiles in executor.map(render_group, font_groups.values()):
+                    text_tiles.update(tiles)
         else:
-            fonts_to_try.extend([
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
-            ])
+            for keys in font_groups.values():
+                text_tiles.update(render_group(keys))
+        
+        # Composite in z-order on the main thread
+        for key, s_min_x, s_min_y, s_box_w, s_box_h in placements:
+            tile = text_tiles.get(key)
+            if tile is None:
+                continue
+            tw, th = tile.size
+            
+            if key[4]:
+                # Center rotated text in box
+                paste_x = int(s_min_x + (s_box_w - tw) / 2)
+                paste_y = int(s_min_y + (s_box_h - th) / 2)
+            else:
+                # Center vertically, left align horizontally (small padding)
+                paste_x = int(s_min_x + 2)
+                paste_y = int(s_min_y + (s_box_h - th) / 2)
             
-        # Add fallbacks
-        fonts_to_try.append(self.default_font_path)
+            img.paste(tile, (paste_x, paste_y), tile)
         
-        for font_path in fonts_to_try:
+        # Convert to BGR (standard OpenCV format) and downsample to original size;
+        # INTER_AREA is the appropriate filter for integer-factor reduction
+        canvas = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)
+        final = cv2.resize(canvas, (width, height), interpolation=cv2.INTER_AREA)
+        
+        # Smart Ghosting: Use VERY FADED original as background for alignment verification
+        # The reconstruction is primarily OCR TEXT - the ghost is just a subtle alignment guide
+        if original_image is not None:
+            # VERY LOW opacity (40/255) over white - ghost is barely visible
+            ghost_alpha = 40 / 255
+            ghost = cv2.convertScaleAbs(
+                original_image, alpha=ghost_alpha, beta=255 * (1 - ghost_alpha)
+            )
+            # Multiply keeps dark text dark while tinting the white background,
+            # so OCR text stays the primary content
+            final = cv2.multiply(final, ghost, scale=1 / 255)
+        
+        return final
+    
+    @staticmethod
+    def _resolve_font_path(candidates: list[str]) -> str | None:
+        """Return the first candidate font that can be opened."""
+        for font_path in candidates:
             try:
-                return ImageFont.truetype(font_path, size)
+                _load_font(font_path, 10)
+                return font_path
             except OSError:
                 continue
+        return None
+    
+    def _get_font(self, size: int, is_bold: bool = False) -> ImageFont.FreeTypeFont:
+        """Get font with fallback, supporting bold weight."""
+        font_path = self._bold_font_path if is_bold else self._regular_font_path
+        if font_path is not None:
+            return _load_font(font_path, size)
                 
         # Last resort
         return ImageFont.load_default()
@@ -451,6 +538,8 @@ class ImageComparisonService:
         original: NDArray[np.uint8],
         reconstructed: NDArray[np.uint8],
         text_mask: NDArray[np.uint8] | None = None,
+        produce_diff_heatmap: bool = False,
+        original_gray: NDArray[np.uint8] | None = None,
     ) -> VerificationResult:
         """
         Compare original and reconstructed images.
@@ -459,9 +548,11 @@ class ImageComparisonService:
             original: Original image
             reconstructed: Reconstructed image from OCR
             text_mask: Optional mask highlighting text regions
+            produce_diff_heatmap: Whether to render the diff visualization
+            original_gray: Optional precomputed grayscale of the original
             
         Returns:
-            VerificationResult with metrics and diff visualization
+            VerificationResult with metrics and optional diff visualization
         """
         # Ensure same size
         if original.shape[:2] != reconstructed.shape[:2]:
@@ -471,7 +562,9 @@ class ImageComparisonService:
             )
         
         # Convert to grayscale for comparison
-        if len(original.shape) == 3:
+        if original_gray is not None:
+            orig_gray = original_gray
+        elif len(original.shape) == 3:
             orig_gray = cv2.cvtColor(original, cv2.COLOR_BGR2GRAY)
         else:
             orig_gray = original
@@ -481,19 +574,25 @@ class ImageComparisonService:
         else:
             recon_gray = reconstructed
         
+        # Identical images need no metrics
+        if not produce_diff_heatmap and np.array_equal(orig_gray, recon_gray):
+            return VerificationResult(
+                ssim_score=1.0,
+                pixel_match_percent=100.0,
+                text_region_match=100.0,
+                diff_image=None,
+                reconstructed_image=reconstructed,
+            )
+        
         # 1. SSIM Score
-        ssim_score, ssim_diff = ssim(
-            orig_gray, recon_gray, 
-            full=True,
-            data_range=255
-        )
+        ssim_score, _ = _fast_ssim(orig_gray, recon_gray)
         
         # 2. Pixel Match Percentage
-        # Threshold difference to binary
+        # One boolean mismatch map is shared by the pixel and text-region counts
         diff = cv2.absdiff(orig_gray, recon_gray)
-        _, thresh_diff = cv2.threshold(diff, 30, 255, cv2.THRESH_BINARY)
+        mismatch = diff > 30
         total_pixels = orig_gray.size
-        matching_pixels = total_pixels - np.count_nonzero(thresh_diff)
+        matching_pixels = total_pixels - np.count_nonzero(mismatch)
         pixel_match = (matching_pixels / total_pixels) * 100
         
         # 3. Text Region Match
@@ -501,16 +600,19 @@ class ImageComparisonService:
         if text_mask is None:
             text_mask = self._create_text_mask(orig_gray)
         
-        masked_diff = cv2.bitwise_and(diff, diff, mask=text_mask)
         text_pixels = np.count_nonzero(text_mask)
         if text_pixels > 0:
-            text_diff_pixels = np.count_nonzero(masked_diff > 30)
+            np.logical_and(mismatch, text_mask, out=mismatch)
+            text_diff_pixels = np.count_nonzero(mismatch)
             text_region_match = ((text_pixels - text_diff_pixels) / text_pixels) * 100
         else:
             text_region_match = 100.0
         
-        # 4. Create diff heatmap
-        diff_heatmap = self._create_diff_heatmap(diff, original.shape)
+        # 4. Create diff heatmap (only when the caller wants to look at it)
+        diff_heatmap = None
+        if produce_diff_heatmap:
+            diff_heatmap = self._create_diff_heatmap(diff, original.shape)
+        del diff
         
         return VerificationResult(
             ssim_score=float(ssim_score),
@@ -562,6 +664,9 @@ class OCRVerificationService:
         self,
         original_image: NDArray[np.uint8],
         ocr_detections: list[dict[str, Any]],
+        produce_diff_heatmap: bool = False,
+        text_mask: NDArray[np.uint8] | None = None,
+        original_gray: NDArray[np.uint8] | None = None,
     ) -> VerificationResult:
         """
         Perform full round-trip OCR verification.
@@ -569,6 +674,9 @@ class OCRVerificationService:
         Args:
             original_image: The original image
             ocr_detections: OCR results with text and bounding boxes
+            produce_diff_heatmap: Whether to render the diff visualization
+            text_mask: Optional precomputed text mask of the original
+            original_gray: Optional precomputed grayscale of the original
             
         Returns:
             VerificationResult with all metrics
@@ -586,6 +694,9 @@ class OCRVerificationService:
         result = self.comparison.compare(
             original=original_image,
             reconstructed=reconstructed,
+            text_mask=text_mask,
+            produce_diff_heatmap=produce_diff_heatmap,
+            original_gray=original_gray,
         )
         
         logger.info(f"Verification complete: SSIM={result.ssim_score:.3f}, "
@@ -600,6 +711,7 @@ class OCRVerificationService:
         ocr_detections: list[dict[str, Any]],
         target_match: float = 95.0,
         max_iterations: int = 3,
+        produce_diff_heatmap: bool = False,
     ) -> tuple[VerificationResult, list[dict[str, Any]]]:
         """
         Iteratively verify and attempt to improve OCR results.
@@ -610,8 +722,21 @@ class OCRVerificationService:
         current_detections = ocr_detections.copy()
         best_result = None
         
+        # The original never changes between iterations
+        if len(original_image.shape) == 3:
+            original_gray = cv2.cvtColor(original_image, cv2.COLOR_BGR2GRAY)
+        else:
+            original_gray = original_image
+        text_mask = self.comparison._create_text_mask(original_gray)
+        
         for iteration in range(max_iterations):
-            result = self.verify(original_image, current_detections)
+            result = self.verify(
+                original_image,
+                current_detections,
+                produce_diff_heatmap=produce_diff_heatmap,
+                text_mask=text_mask,
+                original_gray=original_gray,
+            )
             
             if best_result is None or result.text_region_match > best_result.text_region_match:
                 best_result = result
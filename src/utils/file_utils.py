@@ -5,27 +5,35 @@ File utility functions for document processing.
 import hashlib
 import mimetypes
 import os
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Optional
 
+from ..core.config import get_settings
 
-def get_file_hash(file_path: str | Path, algorithm: str = "sha256") -> str:
+
+def get_file_hash(file_path: str | Path, algorithm: str | None = None) -> str:
     """
     Calculate hash of a file.
     
     Args:
         file_path: Path to the file
-        algorithm: Hash algorithm to use (md5, sha256, etc.)
+        algorithm: Hash algorithm to use (md5, sha256, blake2b, etc.);
+            defaults to the content_hash_algo setting
         
     Returns:
         Hexadecimal hash string
     """
-    hash_obj = hashlib.new(algorithm)
-    
+    algorithm = algorithm or get_settings().content_hash_algo
     with open(file_path, "rb") as f:
-        # Read in chunks to handle large files
-        for chunk in iter(lambda: f.read(8192), b""):
-            hash_obj.update(chunk)
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, algorithm).hexdigest()
+        
+        # Read in 1 MiB chunks into a reusable buffer to handle large files
+        hash_obj = hashlib.new(algorithm)
+        buffer = memoryview(bytearray(1 << 20))
+        while n := f.readinto(buffer):
+            hash_obj.update(buffer[:n])
     
     return hash_obj.hexdigest()
 
@@ -112,6 +120,21 @@ def safe_filename(filename: str) -> str:
     return filename
 
 
+def iter_files(root: str | os.PathLike[str]) -> Iterator[os.DirEntry[str]]:
+    """
+    Recursively yield regular files under root without following symlinks.
+    
+    DirEntry caches the type information returned by the directory listing,
+    so no extra stat() is needed to tell files from directories.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
 def cleanup_old_files(directory: str | Path, max_age_days: int = 30) -> list[Path]:
     """
     Remove files older than specified age.
@@ -130,14 +153,12 @@ def cleanup_old_files(directory: str | Path, max_age_days: int = 30) -> list[Pat
         return []
     
     max_age_seconds = max_age_days * 24 * 60 * 60
-    current_time = time.time()
+    cutoff_time = time.time() - max_age_seconds
     removed = []
     
-    for file_path in directory.rglob("*"):
-        if file_path.is_file():
-            file_age = current_time - file_path.stat().st_mtime
-            if file_age > max_age_seconds:
-                file_path.unlink()
-                removed.append(file_path)
+    for entry in iter_files(directory):
+        if entry.stat(follow_symlinks=False).st_mtime < cutoff_time:
+            os.unlink(entry.path)
+            removed.append(Path(entry.path))
     
     return removed
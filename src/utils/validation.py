@@ -2,13 +2,14 @@
 Validation utilities for document processing.
 """
 
+from functools import lru_cache
 from typing import Optional
 
 from ..core.config import get_settings
 
 
 # Allowed MIME types for document upload
-ALLOWED_MIME_TYPES = {
+ALLOWED_MIME_TYPES = frozenset({
     "application/pdf",
     "image/png",
     "image/jpeg",
@@ -17,7 +18,10 @@ ALLOWED_MIME_TYPES = {
     "image/bmp",
     "image/gif",
     "image/webp",
-}
+})
+
+# Error-message listing of the default allowed types
+_ALLOWED_MIME_TYPES_SORTED_STR = ", ".join(sorted(ALLOWED_MIME_TYPES))
 
 # File extensions mapped to MIME types
 EXTENSION_MIME_MAP = {
@@ -32,12 +36,29 @@ EXTENSION_MIME_MAP = {
     "webp": "image/webp",
 }
 
+# Extensions whose mapped MIME type is allowed by default
+_ALLOWED_EXTENSIONS = frozenset(
+    ext for ext, mime in EXTENSION_MIME_MAP.items() if mime in ALLOWED_MIME_TYPES
+)
+
 
 class ValidationError(Exception):
     """Raised when validation fails."""
     pass
 
 
+def _extract_ext(filename: str) -> str:
+    """Lowercase extension of filename without the dot, or "" if none."""
+    _, sep, ext = filename.rpartition(".")
+    return ext.lower() if sep else ""
+
+
+@lru_cache(maxsize=1)
+def _default_max_upload_bytes() -> int:
+    """Configured upload size limit in bytes."""
+    return int(get_settings().max_upload_size_mb * 1024 * 1024)
+
+
 def validate_file_size(file_size: int, max_size_mb: Optional[float] = None) -> bool:
     """
     Validate that a file is within the allowed size limit.
@@ -53,8 +74,9 @@ def validate_file_size(file_size: int, max_size_mb: Optional[float] = None) -> b
         ValidationError: If file exceeds size limit
     """
     if max_size_mb is None:
-        settings = get_settings()
-        max_size_mb = settings.max_upload_size_mb
+        if file_size <= _default_max_upload_bytes():
+            return True
+        max_size_mb = get_settings().max_upload_size_mb
     
     max_size_bytes = max_size_mb * 1024 * 1024
     
@@ -70,8 +92,8 @@ def validate_file_size(file_size: int, max_size_mb: Optional[float] = None) -> b
 def validate_file_type(
     mime_type: Optional[str] = None,
     filename: Optional[str] = None,
-    allowed_types: Optional[set[str]] = None
-) -> bool:
+    allowed_types: Optional[frozenset[str] | set[str]] = None
+) -> str:
     """
     Validate that a file type is allowed.
     
@@ -81,7 +103,8 @@ def validate_file_type(
         allowed_types: Set of allowed MIME types (uses default if None)
         
     Returns:
-        True if valid
+        Resolved MIME type: mime_type if given, otherwise the type mapped
+        from the filename extension
         
     Raises:
         ValidationError: If file type is not allowed
@@ -91,15 +114,18 @@ def validate_file_type(
     
     # Check MIME type directly if provided
     if mime_type and mime_type in allowed_types:
-        return True
+        return mime_type
     
     # Check by file extension
     if filename:
-        extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-        if extension in EXTENSION_MIME_MAP:
-            mapped_mime = EXTENSION_MIME_MAP[extension]
-            if mapped_mime in allowed_types:
-                return True
+        extension = _extract_ext(filename)
+        if allowed_types is ALLOWED_MIME_TYPES:
+            if extension in _ALLOWED_EXTENSIONS:
+                return mime_type or EXTENSION_MIME_MAP[extension]
+        else:
+            mapped_mime = EXTENSION_MIME_MAP.get(extension)
+            if mapped_mime is not None and mapped_mime in allowed_types:
+                return mime_type or mapped_mime
     
     # Build error message
     error_msg = "File type not allowed."
@@ -107,7 +133,11 @@ def validate_file_type(
         error_msg += f" Got: {mime_type}."
     if filename:
         error_msg += f" Filename: {filename}."
-    error_msg += f" Allowed types: {', '.join(sorted(allowed_types))}"
+    if allowed_types is ALLOWED_MIME_TYPES:
+        allowed_str = _ALLOWED_MIME_TYPES_SORTED_STR
+    else:
+        allowed_str = ", ".join(sorted(allowed_types))
+    error_msg += f" Allowed types: {allowed_str}"
     
     raise ValidationError(error_msg)
 
@@ -135,13 +165,7 @@ def validate_document_upload(
     validate_file_size(file_size)
     
     # Validate and detect file type
-    validate_file_type(mime_type=mime_type, filename=filename)
-    
-    # Determine final MIME type
-    final_mime_type = mime_type
-    if not final_mime_type:
-        extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-        final_mime_type = EXTENSION_MIME_MAP.get(extension, "application/octet-stream")
+    final_mime_type = validate_file_type(mime_type=mime_type, filename=filename)
     
     # Determine if it's a PDF or image
     is_pdf = final_mime_type == "application/pdf"
@@ -176,6 +200,10 @@ def validate_page_range(
     Raises:
         ValidationError: If page range is invalid
     """
+    # Whole-document request, the common case
+    if start_page <= 1 and end_page == -1 and total_pages > 0:
+        return 1, total_pages
+    
     if total_pages <= 0:
         raise ValidationError("Document has no pages")
     
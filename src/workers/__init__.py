@@ -5,6 +5,7 @@ from src.workers.tasks import (
     cleanup_old_files,
     health_check,
     process_document,
+    refresh_document_terms,
     reprocess_document,
 )
 
@@ -13,5 +14,6 @@ __all__ = [
     "process_document",
     "reprocess_document",
     "cleanup_old_files",
+    "refresh_document_terms",
     "health_check",
 ]
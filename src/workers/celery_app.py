@@ -28,20 +28,29 @@ celery_app.conf.update(
     task_soft_time_limit=540,  # Soft limit 9 minutes
     
     # Worker settings
-    worker_prefetch_multiplier=1,  # One task at a time
+    # One task at a time: long OCR jobs must not sit reserved behind each other.
+    # Workers serving only the short "default" queue can raise this with
+    # --prefetch-multiplier (see `make run-worker-default`).
+    worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=100,  # Restart worker after 100 tasks
+    worker_proc_alive_timeout=120,  # Child processes load OCR models on start-up
     
     # Result settings
     result_expires=86400,  # Results expire after 24 hours
     
-    # Rate limiting
-    task_default_rate_limit="10/m",  # 10 tasks per minute default
-    
     # Retry settings
     task_default_retry_delay=30,  # 30 seconds between retries
     task_max_retries=3,
 )
 
+# Periodic tasks, run by `celery beat`
+celery_app.conf.beat_schedule = {
+    "refresh-document-terms": {
+        "task": "src.workers.tasks.refresh_document_terms",
+        "schedule": float(settings.document_terms_refresh_seconds),
+    },
+}
+
 # Task routes (optional - for multi-queue setup)
 celery_app.conf.task_routes = {
     "src.workers.tasks.process_document": {"queue": "document_processing"},
@@ -2,22 +2,62 @@
 
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from uuid import UUID
 
 from celery import Task
+from celery.signals import worker_process_init
 
 from src.core.config import settings
-from src.core.database import get_sync_session
+from src.core.database import ScopedSyncSession, get_sync_session, sync_engine
 from src.models.enums import DocumentStatus, DocumentType
 from src.services.classification import classify_document, DocumentClassifier
 from src.services.extraction import ExtractionService
-from src.services.ocr import process_document_ocr
+from src.services.ocr import get_ocr_service, process_document_ocr
 from src.services.storage import DocumentRepository
+from src.utils.file_utils import iter_files
 from src.workers.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
+# Concurrent unlink() calls in cleanup_old_files
+_CLEANUP_WORKERS = 16
+
+
+@lru_cache(maxsize=1)
+def _get_extraction_service(use_local_llm: bool) -> ExtractionService:
+    """Extraction service (and its LLM client) shared by tasks in this worker process."""
+    return ExtractionService(use_local_llm=use_local_llm)
+
+
+@lru_cache(maxsize=1)
+def _get_document_classifier() -> DocumentClassifier:
+    """Document classifier shared by tasks in this worker process."""
+    return DocumentClassifier()
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs) -> None:
+    """Reset the inherited DB pool after fork, then warm shared services."""
+    # Drop pooled connections inherited from the parent process
+    ScopedSyncSession.remove()
+    sync_engine.dispose(close=False)
+
+    # Only workers consuming the OCR queue (see task_routes) need the models;
+    # a `-Q default` worker would pay their load time and memory for nothing
+    if "document_processing" not in celery_app.amqp.queues.consume_from:
+        return
+
+    try:
+        get_ocr_service(settings.ocr_language).warmup(run_inference=settings.ocr_warmup)
+        _get_extraction_service(settings.use_local_llm)
+        _get_document_classifier()
+    except Exception as e:
+        # Tasks load whatever is missing lazily, so a failed warm-up is not fatal
+        logger.warning(f"Worker warm-up failed: {e}")
+
 
 class DocumentProcessingTask(Task):
     """Base task class with error handling and retry logic."""
@@ -34,23 +74,22 @@ class DocumentProcessingTask(Task):
         
         # Update document status to FAILED
         if args:
-            document_id = args[0]
-            session = get_sync_session()
+            # process_document leaves the parsed id on the request context
+            doc_uuid = getattr(self.request, "doc_uuid", None) or UUID(args[0])
+            session = ScopedSyncSession()
             try:
-                repo = DocumentRepository(session)
-                repo.update_document_status_sync(
-                    UUID(document_id),
+                DocumentRepository(session).set_document_status_sync(
+                    doc_uuid,
                     DocumentStatus.FAILED,
                     error_log=str(exc),
                 )
                 session.commit()
             except Exception as e:
+                session.rollback()
                 logger.error(f"Failed to update document status: {e}")
-            finally:
-                session.close()
 
 
-@celery_app.task(bind=True, base=DocumentProcessingTask)
+@celery_app.task(bind=True, base=DocumentProcessingTask, rate_limit="10/m")
 def process_document(self, document_id: str, file_path: str) -> dict:
     """
     Main document processing task.
@@ -72,11 +111,13 @@ def process_document(self, document_id: str, file_path: str) -> dict:
     
     session = get_sync_session()
     doc_uuid = UUID(document_id)
+    self.request.doc_uuid = doc_uuid
     
     try:
         repo = DocumentRepository(session)
         
-        # Update status to PROCESSING
+        # Update status to PROCESSING; committed before OCR so clients see it
+        # and the row lock is not held for the whole OCR run
         repo.update_document_status_sync(doc_uuid, DocumentStatus.PROCESSING)
         session.commit()
         
@@ -95,13 +136,15 @@ def process_document(self, document_id: str, file_path: str) -> dict:
         
         logger.info(f"[{document_id}] OCR completed. Confidence: {ocr_confidence:.2%}")
         
-        # Update document with OCR results
+        # Update document with OCR results; committed durably on its own,
+        # ahead of the asynchronously committed OCR row insert below
         repo.update_document_ocr_sync(
             doc_uuid,
             raw_text=raw_text,
             ocr_confidence=ocr_confidence,
             page_count=page_count,
         )
+        session.commit()
 
         # Step 1.5: Check for empty text
         if not raw_text or not raw_text.strip():
@@ -121,20 +164,9 @@ def process_document(self, document_id: str, file_path: str) -> dict:
                 "page_count": page_count,
             }
         
-        # Store detailed OCR results
-        ocr_detections = []
-        for detection in ocr_result["detections"]:
-            ocr_detections.append({
-                "page_number": detection.get("page", 1),
-                "text": detection["text"],
-                "confidence": detection["confidence"],
-                "bounding_box": detection["bounding_box"],
-                "sequence_order": detection.get("sequence_order"),
-            })
-        
-        if ocr_detections:
-            repo.create_ocr_results_sync(doc_uuid, ocr_detections)
-        
+        # Store detailed OCR results; the repository maps detection keys to columns.
+        # Detections are regenerable, so this transaction commits asynchronously
+        repo.create_ocr_results_sync(doc_uuid, ocr_result["detections"])
         session.commit()
         
         # Step 2: Classification
@@ -145,8 +177,8 @@ def process_document(self, document_id: str, file_path: str) -> dict:
         if classification.document_type == DocumentType.UNKNOWN:
             logger.info(f"[{document_id}] Keyword classification uncertain. Attempting LLM fallback...")
             try:
-                extraction_service = ExtractionService(use_local_llm=settings.use_local_llm)
-                llm_classifier = DocumentClassifier()
+                extraction_service = _get_extraction_service(settings.use_local_llm)
+                llm_classifier = _get_document_classifier()
                 llm_result = llm_classifier.classify_with_llm(raw_text, extraction_service.llm_client)
                 
                 if llm_result.document_type != DocumentType.UNKNOWN:
@@ -160,41 +192,42 @@ def process_document(self, document_id: str, file_path: str) -> dict:
         
         logger.info(f"[{document_id}] Final Classification: {document_type} ({classification_confidence:.2%})")
         
-        repo.update_document_classification_sync(
-            doc_uuid,
-            document_type=document_type,
-            classification_confidence=classification_confidence,
-        )
-        session.commit()
-        
         # Step 3: Field Extraction
-        logger.info(f"[{document_id}] Extracting fields...")
-        
-        try:
-            extraction_service = ExtractionService(use_local_llm=settings.use_local_llm)
-            extracted_data, extraction_confidence = extraction_service.extract_with_confidence(
-                raw_text,
-                document_type,
-            )
-            
-            logger.info(f"[{document_id}] Extraction completed. Fields: {len(extracted_data)}")
-            
-            # Store extracted metadata
-            repo.create_extracted_metadata_sync(
-                document_id=doc_uuid,
-                document_type=document_type.value,
-                data=extracted_data,
-                extraction_model=extraction_service.model_name,
-                extraction_confidence=extraction_confidence,
-            )
-            session.commit()
-        except Exception as e:
-            logger.error(f"[{document_id}] Extraction failed: {e}")
-            # Don't fail the whole process, just skip extraction
+        extraction_confidence = 0.0
+        if document_type == DocumentType.UNKNOWN:
+            # Nothing type-specific to extract; leave it to a reviewer rather
+            # than spending an LLM call on a generic extraction
+            logger.info(f"[{document_id}] Unclassified document, skipping extraction")
             needs_review = True
-            # Optionally log the error in the document error log, but append it
-            # repo.update_document_status_sync(doc_uuid, DocumentStatus.PROCESSING, error_log=f"Extraction failed: {e}")
-            # session.commit()
+        else:
+            logger.info(f"[{document_id}] Extracting fields...")
+            
+            try:
+                extraction_service = _get_extraction_service(settings.use_local_llm)
+                extracted_data, extraction_confidence = extraction_service.extract_with_confidence(
+                    raw_text,
+                    document_type,
+                )
+                
+                logger.info(f"[{document_id}] Extraction completed. Fields: {len(extracted_data)}")
+                
+                # Store extracted metadata; committed with the final status, in a
+                # savepoint so a failed insert does not abort the finalization
+                with session.begin_nested():
+                    repo.create_extracted_metadata_sync(
+                        document_id=doc_uuid,
+                        document_type=document_type.value,
+                        data=extracted_data,
+                        extraction_model=extraction_service.model_name,
+                        extraction_confidence=extraction_confidence,
+                    )
+            except Exception as e:
+                logger.error(f"[{document_id}] Extraction failed: {e}")
+                # Don't fail the whole process, just skip extraction
+                needs_review = True
+                # Optionally log the error in the document error log, but append it
+                # repo.update_document_status_sync(doc_uuid, DocumentStatus.PROCESSING, error_log=f"Extraction failed: {e}")
+                # session.commit()
         
         # Step 4: Determine final status
         if needs_review or ocr_confidence < settings.ocr_confidence_threshold:
@@ -203,7 +236,13 @@ def process_document(self, document_id: str, file_path: str) -> dict:
         else:
             final_status = DocumentStatus.COMPLETED
         
-        repo.update_document_status_sync(doc_uuid, final_status)
+        # Classification is persisted together with the final status
+        repo.finalize_document_sync(
+            doc_uuid,
+            status=final_status,
+            document_type=document_type,
+            classification_confidence=classification_confidence,
+        )
         session.commit()
         
         logger.info(f"[{document_id}] Processing completed. Status: {final_status}")
@@ -218,8 +257,9 @@ def process_document(self, document_id: str, file_path: str) -> dict:
         }
         
     except Exception as e:
+        tb = traceback.format_exc()
         logger.error(f"[{document_id}] Processing failed: {e}")
-        logger.error(traceback.format_exc())
+        logger.error(tb)
         
         # Update status to FAILED
         try:
@@ -227,7 +267,7 @@ def process_document(self, document_id: str, file_path: str) -> dict:
             repo.update_document_status_sync(
                 doc_uuid,
                 DocumentStatus.FAILED,
-                error_log=f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}",
+                error_log=f"{type(e).__name__}: {str(e)}\n{tb}",
             )
             session.commit()
         except Exception:
@@ -244,11 +284,14 @@ def reprocess_document(self, document_id: str) -> dict:
     """
     Reprocess a failed or review-flagged document.
     
+    Resets the document and queues ``process_document`` on its own queue
+    rather than running the pipeline inside this task.
+    
     Args:
         document_id: UUID of the document
         
     Returns:
-        Processing result
+        Job ID of the queued processing task and the document ID
     """
     session = get_sync_session()
     doc_uuid = UUID(document_id)
@@ -266,8 +309,14 @@ def reprocess_document(self, document_id: str) -> dict:
         document.retry_count = (document.retry_count or 0) + 1
         session.commit()
         
-        # Reprocess
-        return process_document(document_id, document.file_path)
+        # Reprocess on the document_processing queue (see task_routes)
+        async_result = process_document.apply_async((document_id, document.file_path))
+        logger.info(f"[{document_id}] Queued for reprocessing. Task: {async_result.id}")
+        
+        return {
+            "job_id": async_result.id,
+            "document_id": document_id,
+        }
         
     finally:
         session.close()
@@ -293,11 +342,25 @@ def cleanup_old_files(days: int = 30) -> dict:
     deleted_count = 0
     deleted_size = 0
     
-    for file_path in upload_dir.rglob("*"):
-        if file_path.is_file():
-            if file_path.stat().st_mtime < cutoff_time:
-                size = file_path.stat().st_size
-                file_path.unlink()
+    candidates: list[tuple[str, int]] = []
+    if upload_dir.exists():
+        for entry in iter_files(upload_dir):
+            st = entry.stat(follow_symlinks=False)
+            if st.st_mtime < cutoff_time:
+                candidates.append((entry.path, st.st_size))
+    
+    def unlink(path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return False
+    
+    # unlink() is latency-bound filesystem metadata work, so overlap the calls
+    with ThreadPoolExecutor(max_workers=_CLEANUP_WORKERS) as executor:
+        paths = [path for path, _ in candidates]
+        for (_, size), deleted in zip(candidates, executor.map(unlink, paths)):
+            if deleted:
                 deleted_count += 1
                 deleted_size += size
     
@@ -309,6 +372,30 @@ def cleanup_old_files(days: int = 30) -> dict:
     }
 
 
+@celery_app.task
+def refresh_document_terms() -> dict:
+    """
+    Rebuild the search-suggestion vocabulary from all OCR text.
+    
+    The refresh rescans the whole corpus, so it runs on the celery beat
+    schedule rather than once per processed document.
+    
+    Returns:
+        Refresh summary
+    """
+    session = get_sync_session()
+    try:
+        DocumentRepository(session).refresh_document_terms_sync()
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    
+    return {"status": "refreshed"}
+
+
 @celery_app.task
 def health_check() -> dict:
     """Health check task to verify worker is running."""
@@ -1,62 +1,87 @@
 #!/usr/bin/env python3
 """Test extraction on multiple identity documents."""
 import requests
-import time
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+from api_script_utils import poll_until_done as _poll_until_done
 
 API_BASE_URL = "http://localhost:8001/api/v1"
 
-def test_document(filepath):
-    """Upload and test a single document."""
-    print(f"\n{'='*60}")
-    print(f"TESTING: {filepath}")
-    print('='*60)
-    
+# Uploads and polls run concurrently; the server's workers do the processing
+MAX_CONCURRENT_DOCS = 8
+
+# Keep-alive connections shared by the uploads and status polls, sized for
+# one connection per concurrent document
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_maxsize=MAX_CONCURRENT_DOCS))
+UPLOAD_TIMEOUT = 30
+REQUEST_TIMEOUT = 5
+
+def upload_document(filepath):
+    """Upload a document and return its ID, or None if the upload failed."""
     if not os.path.exists(filepath):
-        print(f"Error: File not found")
+        print(f"{filepath}: File not found")
         return None
     
-    # Upload
     with open(filepath, 'rb') as f:
         files = {'file': (os.path.basename(filepath), f, 'image/png')}
-        resp = requests.post(f"{API_BASE_URL}/documents/upload", files=files)
+        resp = SESSION.post(f"{API_BASE_URL}/documents/upload", files=files, timeout=UPLOAD_TIMEOUT)
     
     if resp.status_code not in [200, 202]:
-        print(f"Upload failed: {resp.status_code}")
+        print(f"{filepath}: Upload failed: {resp.status_code}")
         return None
     
     doc_id = resp.json().get('job_id')
-    print(f"Document ID: {doc_id}")
+    print(f"{filepath}: Document ID {doc_id}")
+    return doc_id
+
+
+def poll_until_done(doc_id):
+    """Poll a document until it finishes processing; None on timeout."""
+    if doc_id is None:
+        return None
     
-    # Poll
-    for i in range(20):
-        time.sleep(3)
-        r = requests.get(f"{API_BASE_URL}/documents/{doc_id}")
-        data = r.json()
-        status = data.get('status')
-        
-        if status in ['completed', 'failed', 'needs_review']:
-            print(f"\nStatus: {status}")
-            print(f"Type: {data.get('document_type')}")
-            print(f"OCR Confidence: {(data.get('ocr_confidence') or 0) * 100:.1f}%")
-            print(f"Classification: {(data.get('classification_confidence') or 0) * 100:.1f}%")
-            
-            extracted = data.get('extracted_data', {})
-            if extracted:
-                print("\n📋 EXTRACTED FIELDS:")
-                print("-" * 40)
-                for field, value in extracted.items():
-                    if value is not None:
-                        label = field.replace("_", " ").title()
-                        print(f"  {label:25} : {value}")
-            else:
-                print("\nNo extracted data")
-            
-            return data
+    # Poll with backoff for up to 60s
+    return _poll_until_done(
+        SESSION, f"{API_BASE_URL}/documents/{doc_id}", timeout=60, request_timeout=REQUEST_TIMEOUT
+    )
+
+
+def print_result(filepath, data):
+    """Print the outcome for one document."""
+    print(f"\n{'='*60}")
+    print(f"TESTING: {filepath}")
+    print('='*60)
+    
+    if data is None:
+        print("No result (upload failed or timed out)")
+        return
     
-    print("Timeout")
-    return None
+    print(f"\nStatus: {data.get('status')}")
+    print(f"Type: {data.get('document_type')}")
+    print(f"OCR Confidence: {(data.get('ocr_confidence') or 0) * 100:.1f}%")
+    print(f"Classification: {(data.get('classification_confidence') or 0) * 100:.1f}%")
+    
+    extracted = data.get('extracted_data', {})
+    if extracted:
+        print("\n📋 EXTRACTED FIELDS:")
+        print("-" * 40)
+        for field, value in extracted.items():
+            if value is not None:
+                label = field.replace("_", " ").title()
+                print(f"  {label:25} : {value}")
+    else:
+        print("\nNo extracted data")
+
+
+def test_document(filepath):
+    """Upload and test a single document."""
+    data = poll_until_done(upload_document(filepath))
+    print_result(filepath, data)
+    return data
 
 
 def main():
@@ -68,9 +93,14 @@ def main():
         print("No sample documents found!")
         return
     
+    # Upload everything first, then wait on all documents at once
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOCS) as executor:
+        doc_ids = list(executor.map(upload_document, documents))
+        outcomes = list(executor.map(poll_until_done, doc_ids))
+    
     results = {}
-    for doc in documents:
-        result = test_document(doc)
+    for doc, result in zip(documents, outcomes):
+        print_result(doc, result)
         if result:
             doc_type = result.get('document_type', 'unknown')
             fields = len([v for v in result.get('extracted_data', {}).values() if v])
@@ -1,13 +1,19 @@
 
 import requests
-import time
 import sys
 import os
 
+from api_script_utils import poll_until_done
+
 API_BASE_URL = "http://localhost:8001/api/v1"
 BLANK_IMG_PATH = "blank_test_doc.png"
 HANDWRITTEN_IMG_PATH = "test_live_invoice_2.png" # Using previous name but will be treated as handwritten simulation
 
+# One keep-alive connection for the upload and all status polls
+SESSION = requests.Session()
+UPLOAD_TIMEOUT = 30
+REQUEST_TIMEOUT = 5
+
 def test_document(name, filepath, expect_fail=False):
     print(f"\n--- Testing {name} ---")
     if not os.path.exists(filepath):
@@ -15,7 +21,7 @@ def test_document(name, filepath, expect_fail=False):
         return
 
     files = {'file': (os.path.basename(filepath), open(filepath, 'rb'), 'image/png')}
-    resp = requests.post(f"{API_BASE_URL}/documents/upload", files=files)
+    resp = SESSION.post(f"{API_BASE_URL}/documents/upload", files=files, timeout=UPLOAD_TIMEOUT)
     
     if resp.status_code not in [200, 202]:
         print(f"Upload Failed: {resp.status_code}")
@@ -24,29 +30,29 @@ def test_document(name, filepath, expect_fail=False):
     doc_id = resp.json().get('job_id')
     print(f"Uploaded {doc_id}. Polling...")
 
-    for i in range(15):
-        time.sleep(2)
-        r = requests.get(f"{API_BASE_URL}/documents/{doc_id}")
-        status = r.json().get('status')
-        print(f"Status: {status}")
-        
-        if status in ['completed', 'failed', 'needs_review']:
-            if expect_fail:
-                if status == 'failed':
-                     print("SUCCESS: Document failed as expected.")
-                else:
-                     print(f"FAILURE: Expected failed, got {status}")
-            else:
-                if status in ['completed', 'needs_review']:
-                    print(f"SUCCESS: Document finished with status {status}")
-                    print(f"Type: {r.json().get('document_type')}")
-                    print(f"Confidence: {r.json().get('classification_confidence')}")
-                else:
-                    print(f"FAILURE: Unexpected status {status}")
-                    print(r.json().get('error_log'))
-            return
-
-    print("TIMEOUT")
+    # Poll with backoff (capped at 2s) for up to 30s
+    data = poll_until_done(
+        SESSION, f"{API_BASE_URL}/documents/{doc_id}", timeout=30,
+        max_delay=2.0, request_timeout=REQUEST_TIMEOUT, show_progress=True,
+    )
+    if data is None:
+        print("TIMEOUT")
+        return
+    
+    status = data.get('status')
+    if expect_fail:
+        if status == 'failed':
+             print("SUCCESS: Document failed as expected.")
+        else:
+             print(f"FAILURE: Expected failed, got {status}")
+    else:
+        if status in ['completed', 'needs_review']:
+            print(f"SUCCESS: Document finished with status {status}")
+            print(f"Type: {data.get('document_type')}")
+            print(f"Confidence: {data.get('classification_confidence')}")
+        else:
+            print(f"FAILURE: Unexpected status {status}")
+            print(data.get('error_log'))
 
 if __name__ == "__main__":
     test_document("Blank Document", BLANK_IMG_PATH, expect_fail=True)
@@ -7,11 +7,19 @@ It mocks external dependencies where needed and provides detailed feedback.
 """
 
 import asyncio
+import hashlib
 import sys
+import traceback
+import uuid
+from datetime import datetime
 from pathlib import Path
+from functools import lru_cache
 from io import BytesIO
+import PIL
 from PIL import Image, ImageDraw, ImageFont
+import cv2
 import json
+import numpy as np
 
 print("=" * 80)
 print("DOCUMENT INGESTION SERVICE - E2E TEST SUITE")
@@ -21,65 +29,78 @@ print()
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-def create_test_invoice_image() -> BytesIO:
-    """Create a test invoice image."""
-    img = Image.new('RGB', (800, 1000), color='white')
-    draw = ImageDraw.Draw(img)
-    
-    # Try to use a font, fallback to default
+DEJAVU_SANS = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+@lru_cache(maxsize=8)
+def _font(size: int):
+    """Load DejaVu Sans at a size once, falling back to the default font."""
     try:
-        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)
-        font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18)
-    except:
-        font = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-    
-    # Invoice content
-    draw.text((50, 50), "INVOICE", fill='black', font=font)
-    draw.text((50, 100), "Invoice #: INV-2024-001", fill='black', font=font_small)
-    draw.text((50, 140), "Date: 2024-01-15", fill='black', font=font_small)
-    draw.text((50, 180), "Bill To:", fill='black', font=font_small)
-    draw.text((50, 220), "Acme Corporation", fill='black', font=font_small)
-    draw.text((50, 260), "123 Business St", fill='black', font=font_small)
-    draw.text((50, 340), "Items:", fill='black', font=font_small)
-    draw.text((50, 380), "Product A - $100.00", fill='black', font=font_small)
-    draw.text((50, 420), "Product B - $250.00", fill='black', font=font_small)
-    draw.text((50, 500), "Subtotal: $350.00", fill='black', font=font_small)
-    draw.text((50, 540), "Tax (10%): $35.00", fill='black', font=font_small)
-    draw.text((50, 580), "Total Amount: $385.00", fill='black', font=font)
+        return ImageFont.truetype(DEJAVU_SANS, size)
+    except OSError:
+        return ImageFont.load_default()
+
+# Fixed test documents: canvas size and (position, text, font size) lines
+INVOICE_SPEC = ((800, 1000), (
+    ((50, 50), "INVOICE", 24),
+    ((50, 100), "Invoice #: INV-2024-001", 18),
+    ((50, 140), "Date: 2024-01-15", 18),
+    ((50, 180), "Bill To:", 18),
+    ((50, 220), "Acme Corporation", 18),
+    ((50, 260), "123 Business St", 18),
+    ((50, 340), "Items:", 18),
+    ((50, 380), "Product A - $100.00", 18),
+    ((50, 420), "Product B - $250.00", 18),
+    ((50, 500), "Subtotal: $350.00", 18),
+    ((50, 540), "Tax (10%): $35.00", 18),
+    ((50, 580), "Total Amount: $385.00", 24),
+))
+
+RECEIPT_SPEC = ((600, 800), (
+    ((200, 40), "RECEIPT", 20),
+    ((100, 100), "Store: Target", 16),
+    ((100, 140), "Date: 2024-12-30", 16),
+    ((100, 180), "Time: 14:30:00", 16),
+    ((100, 240), "Items:", 16),
+    ((100, 280), "Coffee - $4.50", 16),
+    ((100, 320), "Sandwich - $8.99", 16),
+    ((100, 400), "Total: $13.49", 20),
+    ((100, 450), "Payment: VISA *1234", 16),
+))
+
+IMAGE_CACHE_DIR = Path("test_outputs/.cache")
+
+@lru_cache(maxsize=None)
+def _render_cached(spec) -> bytes:
+    """Render a document spec to PNG bytes, reusing the copy cached by earlier runs.
+
+    The cache key covers the spec and everything else the pixels depend on:
+    the Pillow version and whether DejaVu is installed or _font falls back.
+    """
+    key = repr((spec, PIL.__version__, Path(DEJAVU_SANS).exists()))
+    cached = IMAGE_CACHE_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.png"
+    if cached.exists():
+        return cached.read_bytes()
     
+    size, lines = spec
+    img = Image.new('RGB', size, color='white')
+    draw = ImageDraw.Draw(img)
+    for position, text, font_size in lines:
+        draw.text(position, text, fill='black', font=_font(font_size))
+    
+    # Fast zlib level: these files only need to round-trip through the tests
     buffer = BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
-    return buffer
+    img.save(buffer, format='PNG', compress_level=1)
+    IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cached.write_bytes(buffer.getvalue())
+    return buffer.getvalue()
+
+def create_test_invoice_image() -> BytesIO:
+    """Create a test invoice image."""
+    return BytesIO(_render_cached(INVOICE_SPEC))
 
 def create_test_receipt_image() -> BytesIO:
     """Create a test receipt image."""
-    img = Image.new('RGB', (600, 800), color='white')
-    draw = ImageDraw.Draw(img)
-    
-    try:
-        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 20)
-        font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-    except:
-        font = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-    
-    # Receipt content
-    draw.text((200, 40), "RECEIPT", fill='black', font=font)
-    draw.text((100, 100), "Store: Target", fill='black', font=font_small)
-    draw.text((100, 140), "Date: 2024-12-30", fill='black', font=font_small)
-    draw.text((100, 180), "Time: 14:30:00", fill='black', font=font_small)
-    draw.text((100, 240), "Items:", fill='black', font=font_small)
-    draw.text((100, 280), "Coffee - $4.50", fill='black', font=font_small)
-    draw.text((100, 320), "Sandwich - $8.99", fill='black', font=font_small)
-    draw.text((100, 400), "Total: $13.49", fill='black', font=font)
-    draw.text((100, 450), "Payment: VISA *1234", fill='black', font=font_small)
-    
-    buffer = BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
-    return buffer
+    return BytesIO(_render_cached(RECEIPT_SPEC))
 
 print("✓ Test image generators created")
 
@@ -100,10 +121,12 @@ try:
     
     with open(test_dir / "test_invoice.png", "wb") as f:
         f.write(test_image.getvalue())
+    with open(test_dir / "test_receipt.png", "wb") as f:
+        f.write(create_test_receipt_image().getvalue())
     
     print("  → Testing grayscale conversion...")
-    import cv2
-    image = cv2.imread(str(test_dir / "test_invoice.png"))
+    # Decode the in-memory PNG; the file on disk is only for the OCR test
+    image = cv2.imdecode(np.frombuffer(test_image.getvalue(), np.uint8), cv2.IMREAD_COLOR)
     gray_result = processor.to_grayscale(image)
     print(f"    ✓ Grayscale image shape: {gray_result.shape}")
     
@@ -112,7 +135,7 @@ try:
     print(f"    ✓ Denoised image shape: {denoised.shape}")
     
     print("  → Testing binarization...")
-    binary = processor.binarize(denoised)
+    binary = processor.binarize(denoised, inplace=True)  # denoised is not reused
     print(f"    ✓ Binary image shape: {binary.shape}")
     
     print("  → Testing complete preprocessing pipeline...")
@@ -123,7 +146,6 @@ try:
     
 except Exception as e:
     print(f"\n✗ Preprocessing pipeline tests FAILED: {e}")
-    import traceback
     traceback.print_exc()
 
 # Test 2: OCR Service
@@ -132,31 +154,33 @@ print("TEST 2: OCR Service")
 print("=" * 80)
 
 try:
-    from src.services.ocr.ocr_service import OCRService
+    from src.services.ocr.ocr_service import get_ocr_service
     
     print("  → Initializing OCR service...")
-    ocr_service = OCRService()
+    ocr_service = get_ocr_service()
+    ocr_service.warmup()  # Model load and first-inference setup stay out of the extraction step
     print("    ✓ OCR service initialized")
     
-    print("  → Extracting text from test invoice...")
-    ocr_results = ocr_service.process_file(str(test_dir / "test_invoice.png"))
+    print("  → Extracting text from test images...")
+    test_images = [test_dir / "test_invoice.png", test_dir / "test_receipt.png"]
+    batch_results = ocr_service.process_batch(test_images)
     
     print(f"    ✓ OCR completed")
-    print(f"    ✓ Pages processed: {len(ocr_results)}")
-    if ocr_results:
-        print(f"    ✓ Page 1 confidence: {ocr_results[0].average_confidence:.2%}")
-        print(f"    ✓ Total text length: {len(ocr_results[0].raw_text)} characters")
-        print(f"    ✓ Detections: {len(ocr_results[0].detections)}")
-        
-        # Show sample text
-        sample_text = ocr_results[0].raw_text[:200].replace('\n', ' ')
-        print(f"    ✓ Sample text: {sample_text}...")
+    for image_path, ocr_results in zip(test_images, batch_results):
+        print(f"    ✓ {image_path.name}: {len(ocr_results)} page(s)")
+        if ocr_results:
+            print(f"    ✓ Page 1 confidence: {ocr_results[0].average_confidence:.2%}")
+            print(f"    ✓ Total text length: {len(ocr_results[0].raw_text)} characters")
+            print(f"    ✓ Detections: {len(ocr_results[0].detections)}")
+            
+            # Show sample text
+            sample_text = ocr_results[0].raw_text[:200].replace('\n', ' ')
+            print(f"    ✓ Sample text: {sample_text}...")
     
     print("\n✓ OCR service tests PASSED")
     
 except Exception as e:
     print(f"\n✗ OCR service tests FAILED: {e}")
-    import traceback
     traceback.print_exc()
 
 # Test 3: Classification Service
@@ -205,7 +229,6 @@ try:
     
 except Exception as e:
     print(f"\n✗ Classification service tests FAILED: {e}")
-    import traceback
     traceback.print_exc()
 
 # Test 4: Models and Schemas
@@ -217,8 +240,6 @@ try:
     from src.models.document import Document, ExtractedMetadata
     from src.models.enums import DocumentStatus, DocumentType
     from src.schemas.document import DocumentUploadResponse
-    import uuid
-    from datetime import datetime
     
     print("  → Testing Document model creation...")
     doc = Document(
@@ -250,7 +271,6 @@ try:
     
 except Exception as e:
     print(f"\n✗ Models and schemas tests FAILED: {e}")
-    import traceback
     traceback.print_exc()
 
 # Test 5: File Utilities
@@ -286,7 +306,6 @@ try:
     
 except Exception as e:
     print(f"\n✗ File utilities tests FAILED: {e}")
-    import traceback
     traceback.print_exc()
 
 # Test 6: Configuration
@@ -310,7 +329,6 @@ try:
     
 except Exception as e:
     print(f"\n✗ Configuration tests FAILED: {e}")
-    import traceback
     traceback.print_exc()
 
 # Summary
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Test handwritten document OCR."""
 import requests
-import time
 import os
 
+from api_script_utils import poll_until_done
+
 API_BASE_URL = "http://localhost:8001/api/v1"
 TEST_FILE = "handwritten_doctor_note.png"
 
@@ -26,26 +27,20 @@ def test_handwritten():
     doc_id = resp.json().get('job_id')
     print(f"Uploaded: {doc_id}")
     
-    # Poll
-    for i in range(15):
-        time.sleep(3)
-        r = requests.get(f"{API_BASE_URL}/documents/{doc_id}")
-        data = r.json()
-        status = data.get('status')
-        print(f"Status: {status}")
-        
-        if status in ['completed', 'failed', 'needs_review']:
-            print(f"\n=== Results ===")
-            print(f"Type: {data.get('document_type')}")
-            print(f"OCR Confidence: {(data.get('ocr_confidence') or 0) * 100:.1f}%")
-            print(f"Classification Confidence: {(data.get('classification_confidence') or 0) * 100:.1f}%")
-            print(f"\nRaw Text Preview:")
-            print(data.get('raw_text', '')[:500])
-            print(f"\nExtracted Data:")
-            print(data.get('extracted_data'))
-            return
+    # Poll with backoff for up to 45s
+    data = poll_until_done(requests, f"{API_BASE_URL}/documents/{doc_id}", timeout=45, show_progress=True)
+    if data is None:
+        print("Timeout")
+        return
     
-    print("Timeout")
+    print(f"\n=== Results ===")
+    print(f"Type: {data.get('document_type')}")
+    print(f"OCR Confidence: {(data.get('ocr_confidence') or 0) * 100:.1f}%")
+    print(f"Classification Confidence: {(data.get('classification_confidence') or 0) * 100:.1f}%")
+    print(f"\nRaw Text Preview:")
+    print(data.get('raw_text', '')[:500])
+    print(f"\nExtracted Data:")
+    print(data.get('extracted_data'))
 
 if __name__ == "__main__":
     test_handwritten()
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 """Test improved insurance card extraction."""
 import requests
-import time
 import os
 import json
 
+from api_script_utils import poll_until_done
+
 API_BASE_URL = "http://localhost:8001/api/v1"
 TEST_FILE = "cigna_card_v2.png"
 
@@ -27,38 +28,32 @@ def test_extraction():
     doc_id = resp.json().get('job_id')
     print(f"Uploaded: {doc_id}")
     
-    # Poll
-    for i in range(20):
-        time.sleep(3)
-        r = requests.get(f"{API_BASE_URL}/documents/{doc_id}")
-        data = r.json()
-        status = data.get('status')
-        print(f"Status: {status}")
-        
-        if status in ['completed', 'failed', 'needs_review']:
-            print(f"\n{'='*50}")
-            print(f"DOCUMENT TYPE: {data.get('document_type')}")
-            print(f"OCR Confidence: {(data.get('ocr_confidence') or 0) * 100:.1f}%")
-            print(f"Classification Confidence: {(data.get('classification_confidence') or 0) * 100:.1f}%")
-            print(f"{'='*50}")
-            
-            extracted = data.get('extracted_data', {})
-            if extracted:
-                print("\n📋 EXTRACTED DATA:")
-                print("-" * 40)
-                for field, value in extracted.items():
-                    if value is not None:
-                        # Format label nicely
-                        label = field.replace("_", " ").title()
-                        print(f"  {label:25} : {value}")
-                print("-" * 40)
-            else:
-                print("\nNo extracted data")
-            
-            return data
+    # Poll with backoff for up to 60s
+    data = poll_until_done(requests, f"{API_BASE_URL}/documents/{doc_id}", timeout=60, show_progress=True)
+    if data is None:
+        print("Timeout")
+        return None
+    
+    print(f"\n{'='*50}")
+    print(f"DOCUMENT TYPE: {data.get('document_type')}")
+    print(f"OCR Confidence: {(data.get('ocr_confidence') or 0) * 100:.1f}%")
+    print(f"Classification Confidence: {(data.get('classification_confidence') or 0) * 100:.1f}%")
+    print(f"{'='*50}")
+    
+    extracted = data.get('extracted_data', {})
+    if extracted:
+        print("\n📋 EXTRACTED DATA:")
+        print("-" * 40)
+        for field, value in extracted.items():
+            if value is not None:
+                # Format label nicely
+                label = field.replace("_", " ").title()
+                print(f"  {label:25} : {value}")
+        print("-" * 40)
+    else:
+        print("\nNo extracted data")
     
-    print("Timeout")
-    return None
+    return data
 
 if __name__ == "__main__":
     test_extraction()
@@ -1,18 +1,58 @@
 #!/usr/bin/env python3
 """Improved OCR verification with character-level accuracy."""
 
+import re
 import sys
 import cv2
-import difflib
+import numpy as np
+from functools import lru_cache
 from pathlib import Path
 
+from rapidfuzz import fuzz
+
 # Add project to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.services.ocr import OCRService
+from src.services.ocr import get_ocr_service
 from src.services.verification import OCRVerificationService
 
 
+# Expected text content (known ground truth for Cigna card)
+EXPECTED_FIELDS = {
+    "company": "cigna",
+    "plan_type": "open access plus",
+    "member_id": "u89084829",
+    "group": "3341475",
+    "name": "varni jain",
+    "pcp_copay": "$20",
+    "specialist_copay": "$40",
+    "er_copay": "$200",
+    "urgent_care": "$50",
+    "rx": "$10",
+    "effective_date": "01/01/2024",
+}
+
+# All expected values in one lookahead alternation (longest first), compiled at
+# import: it reports a match at every position, and a value occurs in the text
+# exactly when it is a prefix of one of those matches
+_EXPECTED_LOWER = sorted({v.lower() for v in EXPECTED_FIELDS.values()}, key=len, reverse=True)
+_FIELD_SCANNER = re.compile("(?=(" + "|".join(map(re.escape, _EXPECTED_LOWER)) + "))")
+
+# Expected composite text for the similarity check, lowercased once
+_EXPECTED_TEXT_LOWER = " ".join(EXPECTED_FIELDS.values()).lower()
+
+
+@lru_cache(maxsize=16)
+def _decode_image(path: str, mtime_ns: int) -> np.ndarray:
+    """Decode an image file; mtime_ns keys the cache so edited files are re-read."""
+    return cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def load_image(path: Path) -> np.ndarray:
+    """Load a BGR image, decoding each version of the file only once per process."""
+    return _decode_image(str(path), path.stat().st_mtime_ns)
+
+
 def test_improved_verification():
     """Run improved verification on Cigna insurance card."""
     
@@ -23,12 +63,12 @@ def test_improved_verification():
         return
     
     print(f"Loading image: {cigna_path}")
-    original_image = cv2.imread(str(cigna_path))
+    original_image = load_image(cigna_path)
     print(f"Image shape: {original_image.shape}")
     
     # Step 1: Run OCR
     print("\n=== Step 1: Running OCR ===")
-    ocr_service = OCRService(language="en")
+    ocr_service = get_ocr_service("en")
     ocr_result = ocr_service.process_image(original_image)
     
     print(f"Detected {len(ocr_result.detections)} text regions")
@@ -37,29 +77,18 @@ def test_improved_verification():
     # Step 2: Character-level Analysis
     print("\n=== Step 2: Character-Level Accuracy ===")
     
-    # Expected text content (known ground truth for Cigna card)
-    expected_fields = {
-        "company": "cigna",
-        "plan_type": "open access plus", 
-        "member_id": "u89084829",
-        "group": "3341475",
-        "name": "varni jain",
-        "pcp_copay": "$20",
-        "specialist_copay": "$40",
-        "er_copay": "$200",
-        "urgent_care": "$50",
-        "rx": "$10",
-        "effective_date": "01/01/2024",
-    }
-    
+    # Lowercased once and shared by the field scan and the similarity check
     raw_text_lower = ocr_result.raw_text.lower()
     
+    starts = set(_FIELD_SCANNER.findall(raw_text_lower))
+    present = {v for v in _EXPECTED_LOWER if any(start.startswith(v) for start in starts)}
+    
     matches = 0
-    total = len(expected_fields)
+    total = len(EXPECTED_FIELDS)
     field_results = []
     
-    for field_name, expected_value in expected_fields.items():
-        found = expected_value.lower() in raw_text_lower
+    for field_name, expected_value in EXPECTED_FIELDS.items():
+        found = expected_value.lower() in present
         matches += 1 if found else 0
         status = "✅" if found else "❌"
         field_results.append(f"  {status} {field_name}: '{expected_value}' {'found' if found else 'NOT FOUND'}")
@@ -75,11 +104,8 @@ def test_improved_verification():
     # Step 3: Text Similarity (Levenshtein-like)
     print("\n=== Step 3: Text Similarity Analysis ===")
     
-    # Create expected composite text for similarity check
-    expected_text = " ".join(expected_fields.values())
-    
     # Find the similarity ratio
-    similarity = difflib.SequenceMatcher(None, expected_text.lower(), raw_text_lower).ratio()
+    similarity = fuzz.ratio(_EXPECTED_TEXT_LOWER, raw_text_lower) / 100.0
     print(f"Sequence Similarity to Expected: {similarity:.2%}")
     
     # Step 4: Bounding Box Coverage
@@ -97,20 +123,18 @@ def test_improved_verification():
     image_h, image_w = original_image.shape[:2]
     total_image_area = image_h * image_w
     
-    total_text_area = 0
-    high_conf_count = 0
-    for det in detections:
-        bbox = det["bounding_box"]
-        if bbox and len(bbox) >= 4:
-            # Calculate polygon area (approximate as rectangle)
-            x_coords = [p[0] for p in bbox]
-            y_coords = [p[1] for p in bbox]
-            width = max(x_coords) - min(x_coords)
-            height = max(y_coords) - min(y_coords)
-            total_text_area += width * height
-            
-        if det["confidence"] >= 0.9:
-                high_conf_count += 1
+    # Axis-aligned area of every quadrilateral, computed in one pass
+    areas = np.zeros(len(detections))
+    boxed = [i for i, det in enumerate(detections) if det["bounding_box"] and len(det["bounding_box"]) >= 4]
+    if boxed:
+        bboxes = np.asarray([detections[i]["bounding_box"][:4] for i in boxed])
+        extents = bboxes.max(axis=1) - bboxes.min(axis=1)
+        areas = areas.astype(extents.dtype)
+        areas[boxed] = extents[:, 0] * extents[:, 1]
+    
+    confs = np.fromiter((det["confidence"] for det in detections), dtype=float, count=len(detections))
+    total_text_area = areas.sum()
+    high_conf_count = int((confs >= 0.9).sum())
     
     coverage_percent = (total_text_area / total_image_area) * 100
     high_conf_percent = (high_conf_count / len(detections)) * 100 if detections else 0
@@ -120,35 +144,20 @@ def test_improved_verification():
 
     # --- Debug: Analyze Largest Detections ---
     print("\n=== Debug: Top 5 Largest Text Regions ===")
-    def get_area(d):
-        bbox = d.get("bounding_box")
-        if not bbox: return 0
-        xs = [p[0] for p in bbox]
-        ys = [p[1] for p in bbox]
-        return (max(xs)-min(xs)) * (max(ys)-min(ys))
-    
-    sorted_dets = sorted(detections, key=get_area, reverse=True)
-    for i, d in enumerate(sorted_dets[:5]):
-        area = get_area(d)
-        print(f"#{i+1}: Text='{d['text']}' Area={area} Conf={d['confidence']:.2f}")
+    for i, idx in enumerate(np.argsort(-areas, kind="stable")[:5]):
+        d = detections[idx]
+        print(f"#{i+1}: Text='{d['text']}' Area={areas[idx]} Conf={d['confidence']:.2f}")
     # -----------------------------------------
 
     # Step 5: Save Verified Images (Critical Step!)
     print("\n=== Step 5: Saving Verification Images ===")
     verification_service = OCRVerificationService()
     
-    # We need to construct the detections list format expected by verify()
-    formatted_detections = []
-    for det in ocr_result.detections:
-        formatted_detections.append({
-            "text": det.text,
-            "bounding_box": det.bounding_box,
-            "confidence": det.confidence
-        })
-        
+    # The Step 4 detection dicts are already in the format verify() expects
     result = verification_service.verify(
         original_image=original_image,
-        ocr_detections=formatted_detections,
+        ocr_detections=detections,
+        produce_diff_heatmap=True,
     )
     
     # Save comparison image
@@ -157,14 +166,20 @@ def test_improved_verification():
         h, w = original_image.shape[:2]
         comparison = cv2.hconcat([original_image, result.reconstructed_image])
         
+        # Encode once and write the same bytes to both locations
+        _, png = cv2.imencode(".png", comparison, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        
         output_path = "verification_comparison_v2.png"
-        cv2.imwrite(output_path, comparison)
+        Path(output_path).write_bytes(png)
         print(f"Saved comparison to: {output_path}")
         
         # Save to artifacts directory too
         artifact_path = f"/home/aarav/.gemini/antigravity/brain/00e7b072-6439-4b08-815e-4c1cd117a3fc/{output_path}"
-        cv2.imwrite(artifact_path, comparison)
-        print(f"Saved artifact to: {artifact_path}")
+        try:
+            Path(artifact_path).write_bytes(png)
+            print(f"Saved artifact to: {artifact_path}")
+        except OSError as e:
+            print(f"Could not save artifact: {e}")
     
     # Step 6: Final Score
     print("\n" + "="*50)
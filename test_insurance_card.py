@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 """Test insurance card OCR and extraction."""
 import requests
-import time
 import os
 import json
 
+from api_script_utils import poll_until_done
+
 API_BASE_URL = "http://localhost:8001/api/v1"
 TEST_FILE = "insurance_card_test.png"
 
@@ -27,27 +28,21 @@ def test_insurance_card():
     doc_id = resp.json().get('job_id')
     print(f"Uploaded: {doc_id}")
     
-    # Poll
-    for i in range(20):
-        time.sleep(3)
-        r = requests.get(f"{API_BASE_URL}/documents/{doc_id}")
-        data = r.json()
-        status = data.get('status')
-        print(f"Status: {status}")
-        
-        if status in ['completed', 'failed', 'needs_review']:
-            print(f"\n=== Results ===")
-            print(f"Type: {data.get('document_type')}")
-            print(f"OCR Confidence: {(data.get('ocr_confidence') or 0) * 100:.1f}%")
-            print(f"Classification Confidence: {(data.get('classification_confidence') or 0) * 100:.1f}%")
-            print(f"\nRaw Text:")
-            print(data.get('raw_text', ''))
-            print(f"\n=== Extracted Data ===")
-            print(json.dumps(data.get('extracted_data'), indent=2))
-            return data
+    # Poll with backoff for up to 60s
+    data = poll_until_done(requests, f"{API_BASE_URL}/documents/{doc_id}", timeout=60, show_progress=True)
+    if data is None:
+        print("Timeout")
+        return None
     
-    print("Timeout")
-    return None
+    print(f"\n=== Results ===")
+    print(f"Type: {data.get('document_type')}")
+    print(f"OCR Confidence: {(data.get('ocr_confidence') or 0) * 100:.1f}%")
+    print(f"Classification Confidence: {(data.get('classification_confidence') or 0) * 100:.1f}%")
+    print(f"\nRaw Text:")
+    print(data.get('raw_text', ''))
+    print(f"\n=== Extracted Data ===")
+    print(json.dumps(data.get('extracted_data'), indent=2))
+    return data
 
 if __name__ == "__main__":
     test_insurance_card()
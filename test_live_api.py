@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 import requests
-import time
 import sys
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import os # Added for file existence check
 
+from api_script_utils import poll_until_done
+
 # Configuration
 API_BASE_URL = "http://localhost:8001/api/v1"
 TEST_PDF_PATH = "test_document.pdf"
@@ -14,10 +15,6 @@ TEST_IMG_PATH = "test_invoice.png"
 def create_test_invoice() -> BytesIO:
     img = Image.new('RGB', (800, 1000), color='white')
     draw = ImageDraw.Draw(img)
-    try:
-        font = ImageFont.load_default()
-    except:
-        font = None
     
     draw.text((50, 50), "INVOICE", fill='black')
     draw.text((50, 100), "Invoice #: INV-LIVE-002", fill='black')
@@ -25,7 +22,7 @@ def create_test_invoice() -> BytesIO:
     draw.text((50, 180), "Total Amount: $1234.56", fill='black')
     
     buffer = BytesIO()
-    img.save(buffer, format='PNG')
+    img.save(buffer, format='PNG', compress_level=1)
     buffer.seek(0)
     return buffer
 
@@ -68,26 +65,18 @@ def test_api():
 
     # 3. Poll for status
     print(f"\nPolling for processing status for document {doc_id}...")
-    max_retries = 20
-    for i in range(max_retries):
-        resp = requests.get(f"{API_BASE_URL}/documents/{doc_id}")
-        if resp.status_code == 200:
-            doc_data = resp.json()
-            status = doc_data.get('status')
-            print(f"Attempt {i+1}: Status = {status}")
-            if status in ['completed', 'failed', 'needs_review']:
-                if status == 'completed':
-                    print("✓ Document processing completed successfully!")
-                elif status == 'needs_review':
-                    print("⚠ Document processed but needs review (low confidence).")
-                else:
-                    print(f"✗ Document processing failed. Error log: {doc_data.get('error_log')}")
-                break
-        else:
-            print(f"Attempt {i+1}: Failed to get details: {resp.status_code}")
-        time.sleep(5)
-    else:
+    # Poll with backoff (capped at 5s) for up to 100s
+    doc_data = poll_until_done(
+        requests, f"{API_BASE_URL}/documents/{doc_id}", timeout=100, max_delay=5.0, show_progress=True
+    )
+    if doc_data is None:
         print("Polling timed out.")
+    elif doc_data.get('status') == 'completed':
+        print("✓ Document processing completed successfully!")
+    elif doc_data.get('status') == 'needs_review':
+        print("⚠ Document processed but needs review (low confidence).")
+    else:
+        print(f"✗ Document processing failed. Error log: {doc_data.get('error_log')}")
 
     # 4. Final verification
     resp = requests.get(f"{API_BASE_URL}/documents/{doc_id}")
@@ -1,10 +1,13 @@
 """Comprehensive OCR testing and improvement validation."""
 import asyncio
 import sys
+import time
 from pathlib import Path
 import httpx
 import logging
 
+from api_script_utils import parse_json
+
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
@@ -20,20 +23,28 @@ async def test_single_document(client: httpx.AsyncClient, file_path: Path) -> di
             if resp.status_code != 202:
                 return {"error": f"Upload failed: {resp.status_code}"}
             
-            resp_data = resp.json()
+            resp_data = parse_json(resp)
             doc_id = resp_data.get("job_id") or resp_data.get("document_id")
             
-            # Poll for completion (max 2 minutes)
-            for _ in range(60):
-                await asyncio.sleep(2)
-                resp = await client.get(f"{API_URL}/documents/{doc_id}", timeout=10.0)
+            # Poll the lightweight status endpoint with exponential backoff
+            # (max 2 minutes) and fetch the full document only once it is done
+            delay = 0.25
+            deadline = time.monotonic() + 120
+            while time.monotonic() < deadline:
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, 4.0)
+                resp = await client.get(f"{API_URL}/documents/{doc_id}/status", timeout=10.0)
                 if resp.status_code != 200:
                     continue
                     
-                doc = resp.json()
-                status = doc["status"]
+                status_data = parse_json(resp)
+                status = status_data["status"]
                 
                 if status in ["completed", "needs_review"]:
+                    resp = await client.get(f"{API_URL}/documents/{doc_id}", timeout=10.0)
+                    if resp.status_code != 200:
+                        return {"error": f"Fetching document failed: {resp.status_code}"}
+                    doc = parse_json(resp)
                     return {
                         "file": file_path.name,
                         "status": status,
@@ -44,7 +55,7 @@ async def test_single_document(client: httpx.AsyncClient, file_path: Path) -> di
                         "line_count": doc.get("raw_text", "").count("\\n") + 1 if doc.get("raw_text") else 0
                     }
                 elif status == "failed":
-                    return {"error": f"Processing failed: {doc.get('error_log', 'Unknown error')}"}
+                    return {"error": f"Processing failed: {status_data.get('error_log', 'Unknown error')}"}
             
             return {"error": "Timeout waiting for processing"}
             
@@ -1,14 +1,46 @@
 """
 Test OCR Round-Trip Verification on Passport Document
 """
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import cv2
 import numpy as np
 from pathlib import Path
+from src.services.ocr.ocr_service import get_ocr_service
 from src.services.verification.image_verification import OCRVerificationService
 
+
+ARTIFACT_DIR = Path("/home/aarav/.gemini/antigravity/brain/00e7b072-6439-4b08-815e-4c1cd117a3fc")
+
+
+def _write_artifact(path: Path, data) -> bool:
+    """Write an artifact copy, reporting (not raising) when the directory is missing."""
+    try:
+        path.write_bytes(data)
+        return True
+    except OSError as e:
+        print(f"Could not save artifact: {e}")
+        return False
+
+
+def _encode_png(image: np.ndarray) -> np.ndarray:
+    """Encode an image as PNG with fast (level 1) compression."""
+    ok, png = cv2.imencode(".png", image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    if not ok:
+        raise ValueError(f"Could not encode image of shape {image.shape} as PNG")
+    return png
+
+
+@lru_cache(maxsize=None)
+def _verification_service() -> OCRVerificationService:
+    """Build the verification service once and reuse it on later runs."""
+    return OCRVerificationService()
+
+
 def test_passport_verification():
     # Initialize verification service
-    verification_service = OCRVerificationService()
+    verification_service = _verification_service()
     
     # Load passport image
     image_path = "sample_passport.png"
@@ -26,10 +58,8 @@ def test_passport_verification():
     # Run verification
     print("\n=== Running OCR and Reconstruction ===")
     
-    # First run OCR
-    from src.services.ocr.ocr_service import OCRService
-    ocr_service = OCRService()
-    from pathlib import Path
+    # First run OCR (get_ocr_service keeps the loaded models between runs)
+    ocr_service = get_ocr_service()
     ocr_result = ocr_service.process_image(image, Path(image_path))
     
     # Extract detections
@@ -43,21 +73,30 @@ def test_passport_verification():
     
     print(f"OCR detected {len(ocr_detections)} text regions")
     
-    # Convert OCRDetection objects to dict format for reconstruction compatibility
-    def convert_detection_to_dict(det):
-        """Convert OCRDetection object or dict to standard dict format"""
-        if hasattr(det, '__dict__'):
-            # It's an object with attributes
-            return {
-                'text': det.text if hasattr(det, 'text') else '',
-                'confidence': det.confidence if hasattr(det, 'confidence') else 0,
-                'bounding_box': det.bounding_box if hasattr(det, 'bounding_box') else (det.box if hasattr(det, 'box') else [])
-            }
-        else:
-            # Already a dict
-            return det
+    # Pull the detection fields out once into parallel arrays; the sample
+    # printout reads these directly and verify() gets dicts zipped from them
+    texts = [
+        det.get('text', '') if isinstance(det, dict) else getattr(det, 'text', '')
+        for det in ocr_detections
+    ]
+    confidences = np.fromiter(
+        (
+            det.get('confidence', 0) if isinstance(det, dict) else getattr(det, 'confidence', 0)
+            for det in ocr_detections
+        ),
+        dtype=np.float64,
+        count=len(ocr_detections),
+    )
+    boxes = [
+        (det.get('bounding_box') or det.get('box', [])) if isinstance(det, dict)
+        else getattr(det, 'bounding_box', getattr(det, 'box', []))
+        for det in ocr_detections
+    ]
     
-    ocr_detections_dict = [convert_detection_to_dict(d) for d in ocr_detections]
+    ocr_detections_dict = [
+        {'text': text, 'confidence': float(conf), 'bounding_box': box}
+        for text, conf, box in zip(texts, confidences, boxes)
+    ]
     print(f"Converted {len(ocr_detections_dict)} detections to dict format")
     
     # Now run verification
@@ -70,46 +109,45 @@ def test_passport_verification():
     # Save reconstructed image
     reconstructed = result.reconstructed_image
     if reconstructed is not None:
-        output_path = "passport_verification_result.png"
-        cv2.imwrite(output_path, reconstructed)
-        print(f"\n✅ Reconstructed image saved: {output_path}")
-        
-        # Also save artifact copy
-        artifact_path = "/home/aarav/.gemini/antigravity/brain/00e7b072-6439-4b08-815e-4c1cd117a3fc/passport_verification.png"
-        cv2.imwrite(artifact_path, reconstructed)
-        print(f"✅ Artifact saved: {artifact_path}")
-        
-        # Create side-by-side comparison
-        original_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        reconstructed_rgb = cv2.cvtColor(reconstructed, cv2.COLOR_BGR2RGB)
+        # Create side-by-side comparison; both images are BGR and hstack does
+        # not care about channel order, so no colour conversion is needed
+        side_by_side = reconstructed
         
         # Resize to same height if needed
-        h1, h2 = original_rgb.shape[0], reconstructed_rgb.shape[0]
+        h1, h2 = image.shape[0], side_by_side.shape[0]
         if h1 != h2:
             scale = h1 / h2
-            new_w = int(reconstructed_rgb.shape[1] * scale)
-            reconstructed_rgb = cv2.resize(reconstructed_rgb, (new_w, h1))
+            new_w = int(side_by_side.shape[1] * scale)
+            side_by_side = cv2.resize(side_by_side, (new_w, h1))
         
-        comparison = np.hstack([original_rgb, reconstructed_rgb])
-        comparison_bgr = cv2.cvtColor(comparison, cv2.COLOR_RGB2BGR)
+        comparison_bgr = np.hstack([image, side_by_side])
         
+        # Encode each PNG once (cv2 releases the GIL, so both encode in
+        # parallel) and write the bytes to the local and artifact copies
+        output_path = "passport_verification_result.png"
         comparison_path = "passport_comparison.png"
-        cv2.imwrite(comparison_path, comparison_bgr)
-        print(f"✅ Comparison image saved: {comparison_path}")
+        artifact_path = ARTIFACT_DIR / "passport_verification.png"
+        artifact_comparison = ARTIFACT_DIR / "passport_comparison.png"
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            reconstructed_png, comparison_png = executor.map(
+                _encode_png, [reconstructed, comparison_bgr]
+            )
+            saved = executor.submit(Path(output_path).write_bytes, reconstructed_png)
+            saved_comparison = executor.submit(Path(comparison_path).write_bytes, comparison_png)
+            artifact_saved = executor.submit(_write_artifact, artifact_path, reconstructed_png)
+            executor.submit(_write_artifact, artifact_comparison, comparison_png)
         
-        artifact_comparison = "/home/aarav/.gemini/antigravity/brain/00e7b072-6439-4b08-815e-4c1cd117a3fc/passport_comparison.png"
-        cv2.imwrite(artifact_comparison, comparison_bgr)
+        saved.result()
+        print(f"\n✅ Reconstructed image saved: {output_path}")
+        if artifact_saved.result():
+            print(f"✅ Artifact saved: {artifact_path}")
+        saved_comparison.result()
+        print(f"✅ Comparison image saved: {comparison_path}")
     
     # Print some detected text
     print(f"\n=== Sample Detected Text (first 10) ===\n")
-    for i, det in enumerate(ocr_detections[:10], 1):
-        # Handle both dict and OCRDetection object formats
-        if hasattr(det, 'text'):
-            text = det.text
-            conf = det.confidence if hasattr(det, 'confidence') else 0
-        else:
-            text = det.get('text', '')
-            conf = det.get('confidence', 0)
+    for i, (text, conf) in enumerate(zip(texts[:10], confidences[:10]), 1):
         print(f"{i}. '{text}' (conf: {conf:.2f})")
     
     print(f"\n{'='*60}")
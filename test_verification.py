@@ -9,7 +9,7 @@ from pathlib import Path
 # Add project to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.services.ocr import OCRService
+from src.services.ocr import get_ocr_service
 from src.services.verification import OCRVerificationService
 
 
@@ -33,7 +33,7 @@ def test_cigna_verification():
     
     # Step 1: Run OCR
     print("\n=== Step 1: Running OCR ===")
-    ocr_service = OCRService(language="en")
+    ocr_service = get_ocr_service("en")
     ocr_result = ocr_service.process_image(original_image)
     
     print(f"Detected {len(ocr_result.detections)} text regions")
@@ -55,7 +55,7 @@ def test_cigna_verification():
     # Step 2: Run Verification
     print("\n=== Step 2: Running Round-Trip Verification ===")
     verification_service = OCRVerificationService()
-    result = verification_service.verify(original_image, detections)
+    result = verification_service.verify(original_image, detections, produce_diff_heatmap=True)
     
     # Print results
     print("\n=== Verification Results ===")
@@ -105,6 +105,14 @@ class TestDocumentEndpoints:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_get_status_preview_chars_bounded(self, client):
+        """Test that the status text preview length is validated."""
+        response = client.get(
+            "/api/v1/documents/00000000-0000-0000-0000-000000000000/status?preview_chars=5000"
+        )
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
     def test_list_documents_empty(self, client):
         """Test listing documents when empty."""
         response = client.get("/api/v1/documents")
@@ -120,6 +128,12 @@ class TestDocumentEndpoints:
         
         assert response.status_code == status.HTTP_200_OK
 
+    def test_list_documents_invalid_cursor(self, client):
+        """Test that a malformed keyset cursor is rejected."""
+        response = client.get("/api/v1/documents?cursor=not-a-cursor")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_list_documents_pagination(self, client):
         """Test document list pagination."""
         response = client.get("/api/v1/documents?page=1&page_size=10")
@@ -67,6 +67,16 @@ class TestImagePreprocessor:
         unique_values = np.unique(result)
         assert all(v in [0, 255] for v in unique_values)
 
+    def test_binarize_inplace(self, preprocessor, sample_grayscale_image):
+        """Test in-place binarization matches the copying path."""
+        expected = preprocessor.binarize(sample_grayscale_image)
+        buffer = sample_grayscale_image.copy()
+        
+        result = preprocessor.binarize(buffer, inplace=True)
+        
+        assert result is buffer
+        np.testing.assert_array_equal(result, expected)
+
     def test_binarize_from_color(self, preprocessor, sample_color_image):
         """Test binarization handles color image."""
         result = preprocessor.binarize(sample_color_image)
@@ -99,6 +109,22 @@ class TestImagePreprocessor:
         assert result is not None
         assert len(result.shape) == 2  # Should be grayscale
 
+    def test_preprocess_leaves_input_untouched(self, preprocessor, sample_grayscale_image):
+        """Test the pipeline never writes into or returns the caller's array."""
+        original = sample_grayscale_image.copy()
+        
+        binarized = preprocessor.preprocess(sample_grayscale_image, apply_denoise=True, apply_deskew=False)
+        untouched = preprocessor.preprocess(
+            sample_grayscale_image,
+            apply_denoise=False,
+            apply_binarize=False,
+            apply_deskew=False,
+        )
+        
+        np.testing.assert_array_equal(sample_grayscale_image, original)
+        assert binarized is not sample_grayscale_image
+        assert untouched is not sample_grayscale_image
+
     def test_preprocess_options(self, preprocessor, sample_color_image):
         """Test preprocessing with different options."""
         # Only grayscale
@@ -0,0 +1,97 @@
+"""Tests for the document repository."""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from src.models import Document, DocumentStatus
+from src.services.storage import DocumentRepository
+
+pytestmark = pytest.mark.asyncio
+
+
+@compiles(TSVECTOR, "sqlite")
+def _compile_tsvector_sqlite(element, compiler, **kw):
+    """Store the PostgreSQL search vector as plain text under SQLite."""
+    return "TEXT"
+
+
+@pytest_asyncio.fixture
+async def documents_session(tmp_path):
+    """Async session on a SQLite database holding only the documents table."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'documents.db'}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register_functions(dbapi_connection, connection_record):
+        # Stand-in for the generated text_search_vector column's expression
+        dbapi_connection.create_function(
+            "to_tsvector", 2, lambda config, text: text, deterministic=True
+        )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Document.__table__.create)
+
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+    await engine.dispose()
+
+
+async def _add_documents(session: AsyncSession, timestamps: list[datetime]) -> None:
+    """Insert one completed document per upload timestamp."""
+    session.add_all(
+        Document(
+            filename=f"doc_{i}.pdf",
+            original_filename=f"doc_{i}.pdf",
+            file_path=f"/tmp/doc_{i}.pdf",
+            status=DocumentStatus.COMPLETED,
+            upload_timestamp=timestamp,
+        )
+        for i, timestamp in enumerate(timestamps)
+    )
+    await session.commit()
+
+
+class TestListDocumentsAfter:
+    """Tests for keyset pagination in DocumentRepository.list_documents_after."""
+
+    async def test_pages_through_timestamp_ties(self, documents_session):
+        """Test that documents sharing an upload timestamp are neither skipped nor repeated."""
+        tied = datetime(2024, 1, 15, 12, 0, 0)
+        await _add_documents(documents_session, [tied] * 5 + [tied - timedelta(hours=1)])
+        repo = DocumentRepository(documents_session)
+
+        seen, pages, cursor = [], [], None
+        while True:
+            documents, has_more = await repo.list_documents_after(cursor=cursor, page_size=2)
+            seen.extend(documents)
+            pages.append((len(documents), has_more))
+            if not has_more:
+                break
+            cursor = (documents[-1].upload_timestamp, documents[-1].id)
+
+        assert pages == [(2, True), (2, True), (2, False)]
+        assert len({doc.id for doc in seen}) == 6
+        assert seen[-1].upload_timestamp == tied - timedelta(hours=1)
+
+    async def test_has_more_false_on_exact_last_page(self, documents_session):
+        """Test that a final page filled exactly to page_size reports no more rows."""
+        start = datetime(2024, 1, 15)
+        await _add_documents(documents_session, [start + timedelta(minutes=i) for i in range(4)])
+        repo = DocumentRepository(documents_session)
+
+        first, first_has_more = await repo.list_documents_after(page_size=2)
+        second, second_has_more = await repo.list_documents_after(
+            cursor=(first[-1].upload_timestamp, first[-1].id), page_size=2
+        )
+
+        assert first_has_more is True
+        assert second_has_more is False
+        assert [doc.upload_timestamp for doc in first + second] == [
+            start + timedelta(minutes=i) for i in (3, 2, 1, 0)
+        ]
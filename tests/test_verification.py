@@ -0,0 +1,165 @@
+"""Tests for OCR verification services."""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.services.verification import ImageComparisonService, ImageReconstructionService
+from src.services.verification.image_verification import _fast_ssim
+
+
+class TestFastSSIM:
+    """Tests for the OpenCV SSIM implementation."""
+
+    @pytest.fixture
+    def sample_gray_image(self):
+        """Create a grayscale image with text-like strokes."""
+        img = np.full((120, 160), 255, dtype=np.uint8)
+        cv2.putText(img, "INVOICE", (5, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 2)
+        return img
+
+    def test_identical_images_score_one(self, sample_gray_image):
+        """Test that an image compared to itself scores 1.0."""
+        score, _ = _fast_ssim(sample_gray_image, sample_gray_image)
+
+        assert score == pytest.approx(1.0)
+
+    def test_different_images_score_lower(self, sample_gray_image):
+        """Test that a blank image scores below the original."""
+        blank = np.full_like(sample_gray_image, 255)
+
+        score, _ = _fast_ssim(sample_gray_image, blank)
+
+        assert 0.0 < score < 0.95
+
+    def test_constant_image_matches_general_path(self, sample_gray_image):
+        """Test that the blank-image shortcut agrees with the full computation."""
+        blank = np.full_like(sample_gray_image, 255)
+        nearly_blank = blank.copy()
+        nearly_blank[0, 0] = 254
+
+        blank_score, _ = _fast_ssim(sample_gray_image, blank)
+        general_score, _ = _fast_ssim(sample_gray_image, nearly_blank)
+
+        assert blank_score == pytest.approx(general_score, abs=1e-3)
+
+    def test_quality_map_optional(self, sample_gray_image):
+        """Test that the SSIM map is only returned on request."""
+        _, no_map = _fast_ssim(sample_gray_image, sample_gray_image)
+        _, ssim_map = _fast_ssim(sample_gray_image, sample_gray_image, need_quality_map=True)
+
+        assert no_map is None
+        assert ssim_map.shape == sample_gray_image.shape
+
+    def test_exact_wang_gaussian_window(self, sample_gray_image):
+        """Test the Gaussian-window variant against identical and blank images."""
+        blank = np.full_like(sample_gray_image, 255)
+
+        same, _ = _fast_ssim(sample_gray_image, sample_gray_image, exact_wang=True)
+        different, _ = _fast_ssim(sample_gray_image, blank, exact_wang=True)
+
+        assert same == pytest.approx(1.0)
+        assert 0.0 < different < 0.95
+
+    @pytest.mark.parametrize("exact_wang", [False, True])
+    def test_image_smaller_than_window(self, exact_wang):
+        """Test that images thinner than the window still get a finite score."""
+        strip = np.full((6, 40), 255, dtype=np.uint8)
+        strip[2:4, 5:35] = 0
+        blank = np.full_like(strip, 255)
+
+        same, _ = _fast_ssim(strip, strip, exact_wang=exact_wang)
+        different, _ = _fast_ssim(strip, blank, exact_wang=exact_wang)
+
+        assert same == pytest.approx(1.0)
+        assert 0.0 < different < 0.95
+
+
+class TestImageReconstructionService:
+    """Tests for ImageReconstructionService class."""
+
+    @pytest.fixture
+    def reconstruction(self):
+        """Create reconstruction service instance."""
+        return ImageReconstructionService()
+
+    def test_reconstruct_draws_horizontal_text(self, reconstruction):
+        """Test that horizontal detections are rendered onto the canvas."""
+        detections = [
+            {
+                "text": "Invoice Total",
+                "confidence": 0.95,
+                "bounding_box": [[10, 20], [190, 20], [190, 50], [10, 50]],
+            }
+        ]
+
+        result = reconstruction.reconstruct((100, 200, 3), detections)
+
+        assert result.shape == (100, 200, 3)
+        assert (result[20:50, 10:190] < 128).any()
+        assert (result[60:, :] == 255).all()
+
+    def test_reconstruct_draws_vertical_text(self, reconstruction):
+        """Test that tall, narrow detections are rendered rotated."""
+        detections = [
+            {
+                "text": "SIDEBAR",
+                "confidence": 0.95,
+                "bounding_box": [[80, 10], [100, 10], [100, 150], [80, 150]],
+            }
+        ]
+
+        result = reconstruction.reconstruct((160, 200, 3), detections)
+
+        assert (result[10:150, 80:100] < 128).any()
+
+
+class TestImageComparisonService:
+    """Tests for ImageComparisonService class."""
+
+    @pytest.fixture
+    def comparison(self):
+        """Create comparison service instance."""
+        return ImageComparisonService()
+
+    @pytest.fixture
+    def sample_bgr_image(self):
+        """Create a BGR image with text."""
+        img = np.full((120, 160, 3), 255, dtype=np.uint8)
+        cv2.putText(img, "TOTAL", (5, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
+        return img
+
+    def test_compare_identical(self, comparison, sample_bgr_image):
+        """Test that identical images fully match."""
+        result = comparison.compare(sample_bgr_image, sample_bgr_image.copy())
+
+        assert result.ssim_score == pytest.approx(1.0)
+        assert result.pixel_match_percent == pytest.approx(100.0)
+        assert result.text_region_match == pytest.approx(100.0)
+
+    def test_compare_resizes_reconstruction(self, comparison, sample_bgr_image):
+        """Test that a differently sized reconstruction is resized first."""
+        smaller = cv2.resize(sample_bgr_image, (80, 60))
+
+        result = comparison.compare(sample_bgr_image, smaller)
+
+        assert result.reconstructed_image.shape == sample_bgr_image.shape
+
+    def test_diff_heatmap_opt_in(self, comparison, sample_bgr_image):
+        """Test that the diff heatmap is only rendered on request."""
+        plain = comparison.compare(sample_bgr_image, sample_bgr_image.copy())
+        with_heatmap = comparison.compare(
+            sample_bgr_image, sample_bgr_image.copy(), produce_diff_heatmap=True
+        )
+
+        assert plain.diff_image is None
+        assert with_heatmap.diff_image.shape == sample_bgr_image.shape
+
+    def test_compare_small_image(self, comparison):
+        """Test that an image smaller than the SSIM window gives finite metrics."""
+        strip = np.full((6, 40, 3), 255, dtype=np.uint8)
+        strip[2:4, 5:35] = 0
+
+        result = comparison.compare(strip, np.full_like(strip, 255)).to_dict()
+
+        assert all(np.isfinite(value) for value in result.values() if isinstance(value, float))